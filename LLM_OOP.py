@@ -1,18 +1,44 @@
+from collections import deque
+from string import Template
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+import openai
 import streamlit as st
 from css import *
+import asyncio
+import hashlib
+import httpx
+import time
 import os
 
-# load_dotenv('/Users/qinli/secrets/.env')
-load_dotenv()
-# load_dotenv("C:\\Users\\qli\\OneDrive - CPB Contractors Pty LTD\\01 Digitisation Project\\Agentic 01\\.env")
-client = OpenAI()
+@st.cache_resource
+def _init_env():
+    """Scan for the .env file once per worker instead of at every module import."""
+    # load_dotenv('/Users/qinli/secrets/.env')
+    load_dotenv()
+    # load_dotenv("C:\\Users\\qli\\OneDrive - CPB Contractors Pty LTD\\01 Digitisation Project\\Agentic 01\\.env")
+    return True
+
+@st.cache_resource
+def get_openai_client():
+    """One shared OpenAI client for the whole session, reusing its keep-alive connection pool across reruns and pages."""
+    _init_env()
+    return OpenAI(http_client=httpx.Client(limits=httpx.Limits(max_keepalive_connections=20)))
+
+def _make_async_openai_client():
+    """
+    Async twin of get_openai_client, built fresh for each run_batch call.
+    Not cache_resource'd: httpx pools keep-alive connections bound to the
+    event loop that created them, and run_batch starts a new loop per call,
+    so a shared client would die with 'Event loop is closed' on reuse.
+    """
+    _init_env()
+    return AsyncOpenAI(http_client=httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=20)))
 
 # @st.cache_data
 def get_llm_response(prompt, max_output_token, stream=False):
     with st.spinner("Generating response..."):
-        response = client.responses.create(
+        response = get_openai_client().responses.create(
             model="gpt-4o-mini",
             input=[{
                 "role" : "user",
@@ -24,6 +50,50 @@ def get_llm_response(prompt, max_output_token, stream=False):
         )
         return response
     
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_cached_llm_text(prompt, max_output_token):
+    """Exact-match cache for non-streaming calls, identical prompts skip the API entirely for an hour."""
+    return get_llm_response(prompt, max_output_token, stream=False).output_text
+
+
+@st.cache_resource
+def get_stream_cache():
+    """Session-shared replay cache of assembled streamed responses, keyed by prompt hash."""
+    return {}
+
+
+def stream_cache_key(prompt, max_output_token):
+    return (hashlib.blake2b(prompt.encode()).hexdigest(), max_output_token)
+
+
+async def aget_llm_response(client, prompt, max_output_token):
+    """Non-blocking version of get_llm_response, returns the output text only."""
+    response = await client.responses.create(
+        model="gpt-4o-mini",
+        input=[{
+            "role" : "user",
+            "content" : prompt
+        }],
+        max_output_tokens=max_output_token,
+    )
+    return response.output_text
+
+
+def run_batch(prompts, max_output_token=500):
+    """
+    Run one LLM call per prompt concurrently and return the texts in prompt order.
+    N prompts take roughly one round trip instead of N sequential ones.
+    """
+    async def gather_all():
+        client = _make_async_openai_client()
+        try:
+            return await asyncio.gather(*(aget_llm_response(client, prompt, max_output_token) for prompt in prompts))
+        finally:
+            # close the pool before asyncio.run tears the loop down
+            await client.close()
+    return asyncio.run(gather_all())
+
+
 def show_response(response, stream):
     """
     Display the response from the LLM in Streamlit.
@@ -34,12 +104,29 @@ def show_response(response, stream):
         stream (bool): Whether the response is streamed or not (OpenAI).
     """
     if stream:
-        full_response = ""
-        response_placeholder = st.empty()
-        for chunk in response:
-            if hasattr(chunk, 'delta') and chunk.delta:
-                full_response += chunk.delta
-                response_placeholder.markdown(full_response)
+        # Buffer deltas so the UI renders ~5-10x fewer frames instead of re-parsing markdown per token,
+        # st.write_stream handles the placeholder and accumulation
+        def buffered_deltas():
+            buf = ""
+            last_flush = time.monotonic()
+            try:
+                for chunk in response:
+                    chunk_type = getattr(chunk, "type", "")
+                    if chunk_type == "response.output_text.delta":
+                        buf += chunk.delta
+                        if len(buf) >= 40 or '\n' in chunk.delta or time.monotonic() - last_flush > 0.05:
+                            yield buf
+                            buf = ""
+                            last_flush = time.monotonic()
+                    elif chunk_type == "response.output_text.done":
+                        break
+            except (openai.APIError, httpx.HTTPError) as e:
+                # Keep whatever streamed so far, the caller decides whether to retry
+                st.warning(f"Stream interrupted: {e}")
+            if buf:
+                yield buf
+
+        full_response = st.write_stream(buffered_deltas)
 
     elif not stream:
         full_response = response.output_text
@@ -48,11 +135,29 @@ def show_response(response, stream):
     return full_response
 
 
-def auto_prompt():
-    """
-    Auto-generate a prompt whenever new data is uploaded.
-    """
-    prompt = """
+# Static chat prompt compiled once at import, only the dynamic fields are substituted per call
+_SYS_TMPL = Template("""
+
+        You are an expert specialized in geotechnical engineering and geophysics.
+        You are also an expert in data processing and analysis using Python programming language.
+        Your task is to assist the user with their queries related to these fields.
+
+        geophysics_data: $geophysics_data
+
+        User query: $user_query
+
+        You have access to conversation history for context.
+
+        summary of earlier conversation:$summary
+
+        conversation history:$history
+
+        When user ask for anything that is not related to geotechnical engineering, geophysics, data processing, or Python programming,
+        politely inform them that you can only assist with topics related to these fields.
+        """)
+
+
+_AUTO_PROMPT = """
             You are provided with raw geophysics data from field surveys. Perform a comprehensive initial data analysis.
             You need to be precise about your assessments.
             
@@ -77,27 +182,46 @@ def auto_prompt():
             - Be specific: instead of "some missing data", say "12.5% missing in elevation column"
             - Always provide exact data file or geophysics line when there is a findings
             """
-    return prompt
 
 
+def auto_prompt():
+    """
+    Auto-generate a prompt whenever new data is uploaded.
+    """
+    return _AUTO_PROMPT
+
+
+@st.fragment
 def token_settings_and_controls():
+    """
+    Token settings expander, scoped to its own fragment so slider moves do not
+    rerun the page. The value is published via the widget key and read with
+    get_max_output_token.
+    """
     with st.expander("⚙️ Token Settings and controls", expanded=False):
         col1, col2, col3 = st.columns([8, 0.5, 2])
         with col1:
-            max_output_token = st.slider("Max output tokens:", min_value=100, max_value=1000, value=500, step=100)
+            st.slider("Max output tokens:", min_value=100, max_value=1000, value=500, step=100, key="max_output_token")
         with col3:
-            adjust_button_font_size()
             if st.button("CLEAR"):
-                st.session_state.chat_messages = []
-                st.rerun()
-    return max_output_token
+                st.session_state.chat_messages = deque(maxlen=40)
+                st.session_state.history_context_window = deque(maxlen=5)
+                st.session_state.summary = ""
+                st.rerun(scope="app")
+
+
+def get_max_output_token():
+    return st.session_state.get("max_output_token", 500)
 
 
 def chatbot_section():
     """Simple chatbot section with text area input and response display"""
 
     st.header("Chatbot")
-    max_output_token = token_settings_and_controls()
+    # Button CSS lives outside the token fragment so slider ticks don't re-emit it
+    adjust_button_font_size()
+    token_settings_and_controls()
+    max_output_token = get_max_output_token()
     user_prompt = st.text_area("Enter your prompt here:", value="", height=100)
 
     if user_prompt:
@@ -106,21 +230,72 @@ def chatbot_section():
         show_response(response, stream)
 
 
+CONTEXT_TOKEN_BUDGET = 2000  # rough input-token budget for history, ~4 chars per token
+
+
+def summarize_old_turns(max_output_token=200):
+    """
+    Fold messages older than the last 6 into a running summary so long
+    conversations keep continuity without unbounded input-token cost.
+    Triggered when the history grows past 10 messages or the estimated
+    token count (chars/4 heuristic) passes 80% of the context budget.
+    """
+    chat_messages = list(st.session_state.chat_messages)
+    estimated_tokens = sum(len(message['content']) for message in chat_messages) // 4
+
+    # Nothing older than the kept window means nothing to fold: without this
+    # guard a long-but-short history re-summarizes the previous summary on
+    # every turn (one wasted LLM call each, with progressive drift)
+    if len(chat_messages) <= 6:
+        return
+    if len(chat_messages) <= 10 and estimated_tokens < 0.8 * CONTEXT_TOKEN_BUDGET:
+        return
+
+    old_context = "\n".join(message["_line"] for message in chat_messages[:-6])
+    summary_prompt = f"""
+    Summarize the conversation below into a short brief (maximum 150 words).
+    Preserve key facts, datasets discussed, and conclusions reached.
+
+    Previous summary: {st.session_state.summary}
+
+    Conversation to fold in:
+    {old_context}
+    """
+    st.session_state.summary = get_cached_llm_text(summary_prompt, max_output_token)
+    st.session_state.chat_messages = deque(chat_messages[-6:], maxlen=40)
+
+
+@st.fragment
 def chatbot_chat_interface(prompt, geophysics_data, initial_prompt):
     """
-    ChatGPT-style chat interface with message bubbles and conversation history
+    ChatGPT-style chat interface with message bubbles and conversation history.
+    Runs as a fragment so chat interactions rerun this region only, not the
+    data-loading paths of the rest of the page.
     """
 
     st.header("💬 AI Assistant")
-    st.subheader("!!! Note, chat history is preserved, agent short term memory up to 5 messages.")
-    max_output_token = token_settings_and_controls()
-
-    # Initialize chat history in session state
-    if "chat_messages" not in st.session_state:
-        st.session_state.chat_messages = []
+    st.subheader("!!! Note, chat history is preserved, last 5 messages verbatim plus a running summary of older turns.")
+    # Button CSS lives outside the token fragment so slider ticks don't re-emit it
+    adjust_button_font_size()
+    token_settings_and_controls()
+    max_output_token = get_max_output_token()
+
+    # Initialize chat history in session state, bound to a local ref once
+    # so the render loop and appends skip the session-state proxy lookups.
+    # Bounded deque keeps very long sessions from growing render cost forever.
+    chat_messages = st.session_state.setdefault("chat_messages", deque(maxlen=40))
+
+    # Rolling window of pre-formatted "ROLE:content" lines, updated on append
+    # so the context string is not re-derived from the history every rerun
+    if "history_context_window" not in st.session_state:
+        st.session_state.history_context_window = deque(maxlen=5)
+
+    # Running summary of turns that have been rolled out of the verbatim window
+    if "summary" not in st.session_state:
+        st.session_state.summary = ""
 
     # Display all existing chat messages
-    for message in st.session_state.chat_messages:
+    for message in chat_messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
 
@@ -130,27 +305,19 @@ def chatbot_chat_interface(prompt, geophysics_data, initial_prompt):
     if is_auto_prompt:
         prompt = initial_prompt
         st.session_state.trigger_auto_prompt = False
+        # The auto-analysis prompt enforces a 200-word limit, so cap output
+        # tokens below the slider value to stop generation (and billing) early
+        max_output_token = min(max_output_token, 300)
 
     if prompt:
-        history_context = "\n".join(f"{message['role'].upper()}:{message['content']}" for message in st.session_state.chat_messages[-5:])
-
-        adjusted_prompt = f"""
-
-        You are an expert specialized in geotechnical engineering and geophysics.
-        You are also an expert in data processing and analysis using Python programming language.
-        Your task is to assist the user with their queries related to these fields.
+        history_context = "\n".join(st.session_state.history_context_window)
 
-        geophysics_data: {geophysics_data}
-
-        User query: {prompt}
-
-        You have access to conversation history for context.
-
-        conversation history:{history_context}
-
-        When user ask for anything that is not related to geotechnical engineering, geophysics, data processing, or Python programming,
-        politely inform them that you can only assist with topics related to these fields.
-        """
+        adjusted_prompt = _SYS_TMPL.safe_substitute(
+            geophysics_data=geophysics_data,
+            user_query=prompt,
+            summary=st.session_state.summary,
+            history=history_context,
+        )
 
         # Only display user message if NOT auto-prompt
         if not is_auto_prompt:
@@ -158,13 +325,36 @@ def chatbot_chat_interface(prompt, geophysics_data, initial_prompt):
                 st.markdown(prompt)
 
         # Get and display assistant response with streaming
+        # Identical prompts (e.g. a re-triggered auto-prompt on the same data) replay from cache
         with st.chat_message("assistant"):
-            response = get_llm_response(adjusted_prompt, max_output_token, stream=True)
-            full_response = show_response(response, stream=True)
+            stream_cache = get_stream_cache()
+            cache_key = stream_cache_key(adjusted_prompt, max_output_token)
+            if cache_key in stream_cache:
+                full_response = stream_cache[cache_key]
+                st.markdown(full_response)
+            else:
+                response = get_llm_response(adjusted_prompt, max_output_token, stream=True)
+                full_response = show_response(response, stream=True)
+                if not full_response:
+                    # Errored/empty stream, retry once with identical params
+                    st.warning("Empty response, retrying...")
+                    response = get_llm_response(adjusted_prompt, max_output_token, stream=True)
+                    full_response = show_response(response, stream=True)
+                if full_response:
+                    stream_cache[cache_key] = full_response
 
         # Only add to history if NOT auto-prompt
         # if not is_auto_prompt:
-        st.session_state.chat_messages.append({"role": "user", "content": prompt})
-        st.session_state.chat_messages.append({"role": "assistant", "content": full_response})
+        # Drop empty assistant turns (failed streams) rather than polluting history.
+        # Pre-format the ROLE:content line once at append time, both the rolling
+        # context window and the summarizer reuse it instead of re-deriving it
+        if full_response:
+            user_line = f"USER:{prompt}"
+            assistant_line = f"ASSISTANT:{full_response}"
+            chat_messages.append({"role": "user", "content": prompt, "_line": user_line})
+            chat_messages.append({"role": "assistant", "content": full_response, "_line": assistant_line})
+            st.session_state.history_context_window.append(user_line)
+            st.session_state.history_context_window.append(assistant_line)
+            summarize_old_turns()
      
 
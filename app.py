@@ -1,8 +1,16 @@
+import importlib
 import streamlit as st
 import pandas as pd
 from utils import *
 from LLM_OOP import *
-from pages import data, single_demo, multiple_analysis, data_processing
+
+
+def lazy_page(module_name):
+    """Defer importing a page module until its page actually runs, cutting cold-start cost."""
+    def run_page():
+        importlib.import_module(f"pages.{module_name}").show()
+    run_page.__name__ = module_name  # st.Page derives page identity from the callable name
+    return run_page
 
 page_title = "Geophysics and its Engineering Friends"
 
@@ -29,10 +37,10 @@ if 'all_geophysics' not in st.session_state:
      st.session_state['all_geophysics'] = {'geophysics_data': {}}
 
 
-data_page = st.Page(data.show, title="1. Data", icon="📈", url_path="data.py")
-data_processing_page = st.Page(data_processing.show, title="2. Processing", icon="🛠️", url_path="data_processing.py")
-demo_page = st.Page(single_demo.show, title="3. Single Line Analysis", icon="👷🏻‍♂️", url_path="single_demo.py")
-analysis_page = st.Page(multiple_analysis.show, title="4. Multiple Line Statistics", icon="📊", url_path="multiple_analysis.py")
+data_page = st.Page(lazy_page("data"), title="1. Data", icon="📈", url_path="data.py")
+data_processing_page = st.Page(lazy_page("data_processing"), title="2. Processing", icon="🛠️", url_path="data_processing.py")
+demo_page = st.Page(lazy_page("single_demo"), title="3. Single Line Analysis", icon="👷🏻‍♂️", url_path="single_demo.py")
+analysis_page = st.Page(lazy_page("multiple_analysis"), title="4. Multiple Line Statistics", icon="📊", url_path="multiple_analysis.py")
 
 
 pages = st.navigation([data_page, data_processing_page, demo_page, analysis_page], position="sidebar")
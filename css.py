@@ -1,4 +1,35 @@
+import inspect
+import re
+from functools import lru_cache
+from pathlib import Path
+
 import streamlit as st
+import streamlit.components.v1 as components
+
+# Pre-rendered default stylesheet, regenerated with scripts/generate_css.py
+_STATIC_CSS = Path(__file__).parent / "static" / "custom.css"
+
+# Tags chat messages with plain classnames once so the stylesheet can use
+# cheap class selectors instead of :has(), which forces the browser into a
+# slow style-invalidation path on every streamed token append.
+# Runs in a zero-height component iframe and reaches the app DOM via parent.
+_CHAT_TAG_SCRIPT = """
+<script>
+const doc = window.parent.document;
+if (!window.parent._chatMsgTagger) {
+    window.parent._chatMsgTagger = true;
+    const tag = () => {
+        doc.querySelectorAll('div[data-testid="stChatMessage"]').forEach((msg) => {
+            if (msg.classList.contains('chat-msg-user') || msg.classList.contains('chat-msg-assistant')) return;
+            if (msg.querySelector('[data-testid="stChatMessageAvatarUser"]')) msg.classList.add('chat-msg-user');
+            else if (msg.querySelector('[data-testid="stChatMessageAvatarAssistant"]')) msg.classList.add('chat-msg-assistant');
+        });
+    };
+    tag();
+    new MutationObserver(tag).observe(doc.body, {childList: true, subtree: true});
+}
+</script>
+"""
 
 
 def apply_custom_css(
@@ -97,7 +128,51 @@ def apply_custom_css(
 
     """
 
-    st.markdown(
+    params = (
+            title_font_size, title_color, title_font_family, title_font_weight,
+            header_font_size, header_color, header_font_family, header_font_weight,
+            subheader_font_size, subheader_color, subheader_font_family, subheader_font_weight,
+            text_font_size, text_color, text_font_family, text_font_weight,
+            sidebar_title_font_size, sidebar_title_color, sidebar_title_font_family, sidebar_title_font_weight,
+            sidebar_header_font_size, sidebar_header_color, sidebar_header_font_family, sidebar_header_font_weight,
+            sidebar_subheader_font_size, sidebar_subheader_color, sidebar_subheader_font_family, sidebar_subheader_font_weight,
+            sidebar_write_font_size, sidebar_write_color, sidebar_write_font_family, sidebar_write_font_weight,
+            file_uploader_drag_font_size, file_uploader_drag_color, file_uploader_drag_font_family, file_uploader_drag_font_weight,
+            file_uploader_limit_font_size, file_uploader_limit_color, file_uploader_limit_font_family, file_uploader_limit_font_weight,
+            file_uploader_button_font_size, file_uploader_button_color, file_uploader_button_font_family, file_uploader_button_font_weight,
+            sidebar_bg_color,
+    )
+
+    # Default styling ships as a static stylesheet the browser caches across
+    # sessions (needs server.enableStaticServing), skipping the inline payload
+    if params == _DEFAULT_PARAMS and _STATIC_CSS.exists():
+        st.markdown('<link rel="stylesheet" href="app/static/custom.css">', unsafe_allow_html=True)
+    else:
+        st.markdown(_build_custom_css(*params), unsafe_allow_html=True)
+
+    # st.markdown sanitizes <script>, so the chat-message tagger ships as a
+    # zero-height component iframe alongside the stylesheet
+    components.html(_CHAT_TAG_SCRIPT, height=0)
+
+_DEFAULT_PARAMS = tuple(p.default for p in inspect.signature(apply_custom_css).parameters.values())
+
+@lru_cache(maxsize=32)
+def _build_custom_css(
+    title_font_size, title_color, title_font_family, title_font_weight,
+    header_font_size, header_color, header_font_family, header_font_weight,
+    subheader_font_size, subheader_color, subheader_font_family, subheader_font_weight,
+    text_font_size, text_color, text_font_family, text_font_weight,
+    sidebar_title_font_size, sidebar_title_color, sidebar_title_font_family, sidebar_title_font_weight,
+    sidebar_header_font_size, sidebar_header_color, sidebar_header_font_family, sidebar_header_font_weight,
+    sidebar_subheader_font_size, sidebar_subheader_color, sidebar_subheader_font_family, sidebar_subheader_font_weight,
+    sidebar_write_font_size, sidebar_write_color, sidebar_write_font_family, sidebar_write_font_weight,
+    file_uploader_drag_font_size, file_uploader_drag_color, file_uploader_drag_font_family, file_uploader_drag_font_weight,
+    file_uploader_limit_font_size, file_uploader_limit_color, file_uploader_limit_font_family, file_uploader_limit_font_weight,
+    file_uploader_button_font_size, file_uploader_button_color, file_uploader_button_font_family, file_uploader_button_font_weight,
+    sidebar_bg_color,
+):
+    """Build the full style block once per parameter set; reruns reuse the cached string."""
+    return _minify_css(
         f"""
         <style>
         /* Main content titles */
@@ -251,8 +326,10 @@ def apply_custom_css(
         }}
 
         /* Chat message alignment - ChatGPT style */
+        /* Classes are set by _CHAT_TAG_SCRIPT, plain class selectors avoid
+           the :has() style-invalidation cost during streaming */
         /* Target user messages - align to right */
-        div[data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatarUser"]) {{
+        div[data-testid="stChatMessage"].chat-msg-user {{
             justify-content: flex-end !important;
             flex-direction: row-reverse !important;
             margin-left: auto !important;
@@ -260,52 +337,84 @@ def apply_custom_css(
         }}
 
         /* Target the message content within user messages */
-        div[data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatarUser"]) > div {{
+        div[data-testid="stChatMessage"].chat-msg-user > div {{
             text-align: right !important;
             margin-left: auto !important;
         }}
 
         /* Target assistant messages - align to left */
-        div[data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatarAssistant"]) {{
+        div[data-testid="stChatMessage"].chat-msg-assistant {{
             justify-content: flex-start !important;
             flex-direction: row !important;
             margin-left: 0 !important;
             margin-right: auto !important;
         }}
         </style>
-        """,
-        unsafe_allow_html=True
+        """
     )
 
+def apply_adjustments(title=None, text=None, button=None):
+    """
+    Batch font adjustments into a single st.markdown emit.
+    Each argument is an optional dict of the matching adjust_* parameters,
+    so pages that tweak several element types pay one frontend render
+    instead of one per helper.
+    """
+    parts = []
+    if title is not None:
+        parts.append(_build_title_css(**title))
+    if text is not None:
+        parts.append(_build_text_css(**text))
+    if button is not None:
+        parts.append(_build_button_css(**button))
+    if parts:
+        st.markdown("".join(parts), unsafe_allow_html=True)
+
 def adjust_title_font_size(size_px = 30, color = "#D52020"):
     """Adjust the font size of all h1 titles in the app."""
-    st.markdown(
+    apply_adjustments(title={"size_px": size_px, "color": color})
+
+def adjust_text_font_size(size_px = 14, color = "#FF0000"):
+    """Adjust the font size of all p texts in the app."""
+    apply_adjustments(text={"size_px": size_px, "color": color})
+
+def adjust_button_font_size(size_px=8, height_px=50, color="#E91111", font_weight="bold"):
+    """Adjust the font size, height, and styling of buttons in the app."""
+    apply_adjustments(button={"size_px": size_px, "height_px": height_px, "color": color, "font_weight": font_weight})
+
+def _minify_css(css):
+    """Strip comments and collapse whitespace; the block rides in every rerun delta."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    return re.sub(r"\s+", " ", css).strip()
+
+@lru_cache(maxsize=None)
+def _build_title_css(size_px=30, color="#D52020"):
+    return _minify_css(
         f"""<style>
         h1 {{
             font-size: {size_px}px !important;
             color: {color} !important;
         }}
         </style>
-        """,
-        unsafe_allow_html=True
+        """
     )
 
-def adjust_text_font_size(size_px = 14, color = "#FF0000"):
-    """Adjust the font size of all p texts in the app."""
-    st.markdown(
+@lru_cache(maxsize=None)
+def _build_text_css(size_px=14, color="#FF0000"):
+    return _minify_css(
         f"""<style>
         p {{
             font-size: {size_px}px !important;
             color: {color} !important;
         }}
         </style>
-        """,
-        unsafe_allow_html=True
+        """
     )
 
-def adjust_button_font_size(size_px=8, height_px=50, color="#E91111", font_weight="bold"):
-    """Adjust the font size, height, and styling of buttons in the app."""
-    st.markdown(
+@lru_cache(maxsize=None)
+def _build_button_css(size_px=8, height_px=50, color="#E91111", font_weight="bold"):
+    """Build the button style block once per parameter set; reruns only pay the markdown emit."""
+    return _minify_css(
         f"""<style>
         /* Target the button's parent container - align vertically */
         div[data-testid="stButton"] {{
@@ -332,7 +441,6 @@ def adjust_button_font_size(size_px=8, height_px=50, color="#E91111", font_weigh
             vertical-align: middle !important;
         }}
         </style>
-        """,
-        unsafe_allow_html=True
+        """
     )
 
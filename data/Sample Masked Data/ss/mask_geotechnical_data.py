@@ -4,17 +4,71 @@ Geotechnical Data Masking Script
 Anonymizes project-specific geotechnical data for demonstration purposes
 """
 
+import re
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set random seed for reproducibility
-np.random.seed(42)
+# Particle-size column names: a bare number, optionally followed by "mm"
+_PSD_RE = re.compile(r'^\s*\d+(?:\.\d+)?(?:\s*mm)?\s*$')
+
+# Optional Numba acceleration for the numeric mask kernels
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Below this size the JIT call overhead outweighs the parallel speedup
+NUMBA_MIN_SIZE = 10000
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _add_clip_kernel(arr, variation, lo, hi):
+        for i in prange(arr.shape[0]):
+            v = arr[i]
+            if not np.isnan(v):
+                v = v + variation[i]
+                if v < lo:
+                    v = lo
+                elif v > hi:
+                    v = hi
+                arr[i] = v
+
+    @njit(cache=True, parallel=True)
+    def _mul_clip_kernel(arr, factors, lo, hi, round_result):
+        for i in prange(arr.shape[0]):
+            v = arr[i]
+            if not np.isnan(v):
+                v = v * factors[i]
+                if round_result:
+                    v = np.rint(v)
+                if v < lo:
+                    v = lo
+                elif v > hi:
+                    v = hi
+                arr[i] = v
+
 
 class GeotechnicalDataMasker:
-    def __init__(self):
+    # Numeric columns touched by the lab-file maskers, coerced to float once
+    # up front in process_file instead of per masker call
+    MASKED_NUMERIC_COLUMNS = (
+        'SPT N Value', 'Interpreted Su (4.5)',
+        'LL (%)', 'PL (%)', 'PI (%)',
+        'MC (%) - from Atterberg test', 'MC (%) - from CBR test', 'MC before Swell Test (%)',
+        'UCS (MPa)', 'Cohesion (kPa)_multi_stage', 'Cohesion (kPa)_single_stage',
+        'Friction angle_multi_stage', 'Friction angle_single_stage',
+        'Is(50) Axial', 'Is(50) Diametral', 'Is50 combined', 'Is50d (MPa)', 'Is50a (MPa)',
+        'MDD (t/m3)', 'OMC (%)',
+        'CBR (%) Soaked - 4 Days', 'CBR Swell (%)',
+        'pH value', 'Sulphates (mg/kg)', 'Chlorides (mg/kg)', 'Conductivity (uS/cm)',
+    )
+
+    def __init__(self, seed=42):
         """Initialize the data masker with transformation mappings"""
         
         # Geological origin mappings
@@ -72,106 +126,189 @@ class GeotechnicalDataMasker:
         self.northing_offset = 50000
         self.chainage_offset = -20000
         self.rl_variation = 5  # ±5m random variation
-        
+
+        # Single PCG64 generator shared by all mask_* methods; seed accepts an
+        # int or a SeedSequence so parallel workers get independent streams
+        self.rng = np.random.default_rng(seed)
+        self._scratch = np.empty(0)
+
+        # Warm the JIT kernels so compile time is not paid during masking
+        if NUMBA_AVAILABLE:
+            warm = np.ones(1)
+            _add_clip_kernel(warm, warm, -np.inf, np.inf)
+            _mul_clip_kernel(warm, warm, -np.inf, np.inf, False)
+
+    def _draw(self, low, high, n):
+        """Uniform draws from the shared generator into a reused scratch buffer"""
+        if self._scratch.size < n:
+            self._scratch = np.empty(n)
+        buf = self._scratch[:n]
+        self.rng.random(out=buf)
+        buf *= (high - low)
+        buf += low
+        return buf
+
+    @staticmethod
+    def _to_float_array(df, col):
+        """Pull a column out as a float64 array, coercing strings to NaN"""
+        series = df[col]
+        if series.dtype == object:
+            series = pd.to_numeric(series, errors='coerce')
+        return series.to_numpy(dtype=np.float64)
+
+    def _masked_add(self, df, col, low, high, clip_lower=None, clip_upper=None):
+        """Add uniform variation to the non-NaN entries of a column in one fused pass"""
+        arr = self._to_float_array(df, col)
+        if NUMBA_AVAILABLE and arr.size >= NUMBA_MIN_SIZE:
+            lo = -np.inf if clip_lower is None else clip_lower
+            hi = np.inf if clip_upper is None else clip_upper
+            _add_clip_kernel(arr, self._draw(low, high, arr.size), lo, hi)
+            df[col] = arr
+            return
+        m = ~np.isnan(arr)
+        n = int(m.sum())
+        if n > 0:
+            arr[m] += self._draw(low, high, n)
+            if clip_lower is not None or clip_upper is not None:
+                np.clip(arr, clip_lower, clip_upper, out=arr)
+            df[col] = arr
+
+    def _masked_mul(self, df, col, low, high, clip_lower=None, clip_upper=None, round_result=False):
+        """Multiply the non-NaN entries of a column by uniform factors in one fused pass"""
+        arr = self._to_float_array(df, col)
+        if NUMBA_AVAILABLE and arr.size >= NUMBA_MIN_SIZE:
+            lo = -np.inf if clip_lower is None else clip_lower
+            hi = np.inf if clip_upper is None else clip_upper
+            _mul_clip_kernel(arr, self._draw(low, high, arr.size), lo, hi, round_result)
+            df[col] = arr
+            return
+        m = ~np.isnan(arr)
+        n = int(m.sum())
+        if n > 0:
+            arr[m] *= self._draw(low, high, n)
+            if round_result:
+                np.round(arr, out=arr)
+            if clip_lower is not None or clip_upper is not None:
+                np.clip(arr, clip_lower, clip_upper, out=arr)
+            df[col] = arr
+
     def create_borehole_mapping(self, hole_ids_list):
         """Create consistent borehole ID mapping across files"""
-        unique_ids = []
-        for hole_ids in hole_ids_list:
-            unique_ids.extend(hole_ids)
-        unique_ids = sorted(set(unique_ids))
-        
-        for hole_id in unique_ids:
-            if hole_id not in self.borehole_mapping and pd.notna(hole_id):
-                self.borehole_mapping[hole_id] = f"BH-{self.borehole_counter:03d}"
-                self.borehole_counter += 1
-        
+        # Dedupe and sort in pandas/numpy C routines instead of Python set/sorted
+        combined = pd.concat([pd.Series(hole_ids) for hole_ids in hole_ids_list], ignore_index=True).dropna()
+        unique_ids = np.sort(pd.unique(combined.values))
+
+        new_ids = [hole_id for hole_id in unique_ids if hole_id not in self.borehole_mapping]
+        self.borehole_mapping.update(
+            {hole_id: f"BH-{self.borehole_counter + i:03d}" for i, hole_id in enumerate(new_ids)}
+        )
+        self.borehole_counter += len(new_ids)
+
         return self.borehole_mapping
     
     def mask_borehole_ids(self, df, id_column='Hole_ID'):
         """Apply borehole ID masking"""
         if id_column in df.columns:
-            df[id_column] = df[id_column].map(lambda x: self.borehole_mapping.get(x, x) if pd.notna(x) else x)
+            df[id_column] = self.apply_mapping(df[id_column], self.borehole_mapping)
         return df
+
+    @staticmethod
+    def apply_mapping(series, mapping):
+        """Vectorized dict mapping that keeps unmapped (and NaN) values as-is"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Rewrite only the K categories instead of touching the N codes
+            return series.cat.rename_categories([mapping.get(cat, cat) for cat in series.cat.categories])
+        # replace() preserves unmatched values natively, no fallback pass needed
+        return series.replace(mapping)
     
     def mask_location_data(self, df):
         """Mask location-related data"""
-        # Mask coordinates
+        # Mask coordinates and chainage (NaN + offset stays NaN, no mask needed)
         if 'Easting (m)' in df.columns:
-            mask = df['Easting (m)'].notna()
-            df.loc[mask, 'Easting (m)'] = df.loc[mask, 'Easting (m)'] + self.easting_offset
-        
+            df['Easting (m)'] = df['Easting (m)'] + self.easting_offset
+
         if 'Northing (m)' in df.columns:
-            mask = df['Northing (m)'].notna()
-            df.loc[mask, 'Northing (m)'] = df.loc[mask, 'Northing (m)'] + self.northing_offset
-        
-        # Mask chainage
+            df['Northing (m)'] = df['Northing (m)'] + self.northing_offset
+
         if 'Chainage' in df.columns:
-            mask = df['Chainage'].notna()
-            df.loc[mask, 'Chainage'] = df.loc[mask, 'Chainage'] + self.chainage_offset
-        
-        # Mask surface RL with random variation
+            df['Chainage'] = df['Chainage'] + self.chainage_offset
+
+        # Mask surface RL with random variation, one batched draw shared by all
+        # present columns instead of an RNG call per column
         rl_columns = ['Surface RL (m AHD)', 'Surface RL (mAHD)', 'From (m AHD)']
-        for col in rl_columns:
-            if col in df.columns:
-                mask = df[col].notna()
-                random_variation = np.random.uniform(-self.rl_variation, self.rl_variation, mask.sum())
-                df.loc[mask, col] = df.loc[mask, col] + random_variation
-        
+        present_rl = [col for col in rl_columns if col in df.columns]
+        if present_rl:
+            arrays = {col: self._to_float_array(df, col) for col in present_rl}
+            masks = {col: ~np.isnan(arrays[col]) for col in present_rl}
+            counts = {col: int(masks[col].sum()) for col in present_rl}
+            variations = self._draw(-self.rl_variation, self.rl_variation, sum(counts.values()))
+            offset = 0
+            for col in present_rl:
+                n = counts[col]
+                if n > 0:
+                    arrays[col][masks[col]] += variations[offset:offset + n]
+                    df[col] = arrays[col]
+                offset += n
+
         return df
     
     def mask_geological_classifications(self, df):
         """Mask geological classifications"""
         if 'Geology_Orgin' in df.columns:
-            df['Geology_Orgin'] = df['Geology_Orgin'].map(lambda x: self.geology_mapping.get(x, x) if pd.notna(x) else x)
-        
+            df['Geology_Orgin'] = self.apply_mapping(df['Geology_Orgin'], self.geology_mapping)
+
         if 'Consistency' in df.columns:
-            df['Consistency'] = df['Consistency'].map(lambda x: self.consistency_mapping.get(x, x) if pd.notna(x) else x)
-        
+            df['Consistency'] = self.apply_mapping(df['Consistency'], self.consistency_mapping)
+
         return df
     
+    def create_report_mapping(self, report_series_list):
+        """Create consistent report name mapping across files.
+
+        Pre-building the mapping in the parent keeps report names identical
+        when the files are then processed by independent workers.
+        """
+        combined = pd.concat(list(report_series_list), ignore_index=True).dropna()
+        for report in pd.unique(combined.values):
+            if report not in self.report_mapping:
+                self.report_mapping[report] = f"Geotechnical Report {chr(64 + self.report_counter)}"
+                self.report_counter += 1
+
+        return self.report_mapping
+
     def mask_report_names(self, df):
         """Mask report references"""
         if 'Report' in df.columns:
-            unique_reports = df['Report'].dropna().unique()
+            unique_reports = pd.unique(df['Report'].dropna().values)
             for report in unique_reports:
                 if report not in self.report_mapping:
                     self.report_mapping[report] = f"Geotechnical Report {chr(64 + self.report_counter)}"
                     self.report_counter += 1
-            
-            df['Report'] = df['Report'].map(lambda x: self.report_mapping.get(x, x) if pd.notna(x) else x)
-        
+
+            df['Report'] = self.apply_mapping(df['Report'], self.report_mapping)
+
         return df
     
     def mask_spt_data(self, df):
         """Mask SPT N-values with realistic variation"""
         if 'SPT N Value' in df.columns:
-            mask = df['SPT N Value'].notna()
-            # Apply 0.8-1.2 random multiplier
-            factors = np.random.uniform(0.8, 1.2, mask.sum())
-            df.loc[mask, 'SPT N Value'] = np.round(df.loc[mask, 'SPT N Value'] * factors).astype(int)
-            # Ensure minimum value of 0
-            df.loc[mask, 'SPT N Value'] = df.loc[mask, 'SPT N Value'].clip(lower=0)
-        
+            # Apply 0.8-1.2 random multiplier, rounded and floored at 0
+            self._masked_mul(df, 'SPT N Value', 0.8, 1.2, clip_lower=0, round_result=True)
+
         if 'Interpreted Su (4.5)' in df.columns:
-            mask = df['Interpreted Su (4.5)'].notna()
-            factors = np.random.uniform(0.85, 1.15, mask.sum())
-            df.loc[mask, 'Interpreted Su (4.5)'] = df.loc[mask, 'Interpreted Su (4.5)'] * factors
-        
+            self._masked_mul(df, 'Interpreted Su (4.5)', 0.85, 1.15)
+
         return df
     
     def mask_atterberg_limits(self, df):
         """Mask Atterberg limits while maintaining relationships"""
         if 'LL (%)' in df.columns and 'PL (%)' in df.columns:
             # Mask Liquid Limit
-            ll_mask = df['LL (%)'].notna()
-            ll_variation = np.random.uniform(-5, 5, ll_mask.sum())
-            df.loc[ll_mask, 'LL (%)'] = (df.loc[ll_mask, 'LL (%)'] + ll_variation).clip(lower=0)
-            
+            self._masked_add(df, 'LL (%)', -5, 5, clip_lower=0)
+
             # Mask Plastic Limit proportionally
-            pl_mask = df['PL (%)'].notna()
-            pl_variation = np.random.uniform(-3, 3, pl_mask.sum())
-            df.loc[pl_mask, 'PL (%)'] = (df.loc[pl_mask, 'PL (%)'] + pl_variation).clip(lower=0)
-            
+            self._masked_add(df, 'PL (%)', -3, 3, clip_lower=0)
+
             # Recalculate PI to maintain relationship
             if 'PI (%)' in df.columns:
                 pi_mask = df['LL (%)'].notna() & df['PL (%)'].notna()
@@ -182,146 +319,126 @@ class GeotechnicalDataMasker:
         mc_columns = ['MC (%) - from Atterberg test', 'MC (%) - from CBR test', 'MC before Swell Test (%)']
         for col in mc_columns:
             if col in df.columns:
-                mask = df[col].notna()
-                variation = np.random.uniform(-2, 2, mask.sum())
-                df.loc[mask, col] = (df.loc[mask, col] + variation).clip(lower=0)
-        
+                self._masked_add(df, col, -2, 2, clip_lower=0)
+
         return df
     
     def mask_strength_parameters(self, df):
         """Mask strength parameters"""
         # UCS
         if 'UCS (MPa)' in df.columns:
-            mask = df['UCS (MPa)'].notna()
-            factors = np.random.uniform(0.85, 1.15, mask.sum())
-            df.loc[mask, 'UCS (MPa)'] = (df.loc[mask, 'UCS (MPa)'] * factors).clip(lower=0.1)
-        
+            self._masked_mul(df, 'UCS (MPa)', 0.85, 1.15, clip_lower=0.1)
+
         # Cohesion
         cohesion_columns = ['Cohesion (kPa)_multi_stage', 'Cohesion (kPa)_single_stage']
         for col in cohesion_columns:
             if col in df.columns:
-                mask = df[col].notna()
-                factors = np.random.uniform(0.9, 1.1, mask.sum())
-                df.loc[mask, col] = (df.loc[mask, col] * factors).clip(lower=0)
-        
+                self._masked_mul(df, col, 0.9, 1.1, clip_lower=0)
+
         # Friction angle
         friction_columns = ['Friction angle_multi_stage', 'Friction angle_single_stage']
         for col in friction_columns:
             if col in df.columns:
-                mask = df[col].notna()
-                variation = np.random.uniform(-2, 2, mask.sum())
-                df.loc[mask, col] = (df.loc[mask, col] + variation).clip(lower=0, upper=45)
-        
+                self._masked_add(df, col, -2, 2, clip_lower=0, clip_upper=45)
+
         # Is50 values
         is50_columns = ['Is(50) Axial', 'Is(50) Diametral', 'Is50 combined', 'Is50d (MPa)', 'Is50a (MPa)']
         for col in is50_columns:
             if col in df.columns:
-                mask = df[col].notna()
-                factors = np.random.uniform(0.85, 1.15, mask.sum())
-                df.loc[mask, col] = df.loc[mask, col] * factors
-        
+                self._masked_mul(df, col, 0.85, 1.15)
+
         return df
     
     def mask_compaction_data(self, df):
         """Mask compaction data"""
         if 'MDD (t/m3)' in df.columns:
-            mask = df['MDD (t/m3)'].notna()
-            variation = np.random.uniform(-0.05, 0.05, mask.sum())
-            df.loc[mask, 'MDD (t/m3)'] = (df.loc[mask, 'MDD (t/m3)'] + variation).clip(lower=1.3, upper=2.6)
-        
+            self._masked_add(df, 'MDD (t/m3)', -0.05, 0.05, clip_lower=1.3, clip_upper=2.6)
+
         if 'OMC (%)' in df.columns:
-            mask = df['OMC (%)'].notna()
-            variation = np.random.uniform(-2, 2, mask.sum())
-            df.loc[mask, 'OMC (%)'] = (df.loc[mask, 'OMC (%)'] + variation).clip(lower=3, upper=40)
-        
+            self._masked_add(df, 'OMC (%)', -2, 2, clip_lower=3, clip_upper=40)
+
         return df
     
     def mask_cbr_data(self, df):
         """Mask CBR data"""
         if 'CBR (%) Soaked - 4 Days' in df.columns:
-            mask = df['CBR (%) Soaked - 4 Days'].notna()
-            factors = np.random.uniform(0.85, 1.15, mask.sum())
-            df.loc[mask, 'CBR (%) Soaked - 4 Days'] = (df.loc[mask, 'CBR (%) Soaked - 4 Days'] * factors).clip(lower=1)
-        
+            self._masked_mul(df, 'CBR (%) Soaked - 4 Days', 0.85, 1.15, clip_lower=1)
+
         if 'CBR Swell (%)' in df.columns:
-            mask = df['CBR Swell (%)'].notna()
-            factors = np.random.uniform(0.9, 1.1, mask.sum())
-            df.loc[mask, 'CBR Swell (%)'] = (df.loc[mask, 'CBR Swell (%)'] * factors).clip(lower=0)
-        
+            self._masked_mul(df, 'CBR Swell (%)', 0.9, 1.1, clip_lower=0)
+
         return df
     
     def mask_chemical_properties(self, df):
         """Mask chemical properties"""
         if 'pH value' in df.columns:
-            mask = df['pH value'].notna()
-            variation = np.random.uniform(-0.3, 0.3, mask.sum())
-            df.loc[mask, 'pH value'] = (df.loc[mask, 'pH value'] + variation).clip(lower=3, upper=10)
-        
+            self._masked_add(df, 'pH value', -0.3, 0.3, clip_lower=3, clip_upper=10)
+
+        # _masked_mul coerces any string values to NaN before applying factors
         chemical_columns = ['Sulphates (mg/kg)', 'Chlorides (mg/kg)', 'Conductivity (uS/cm)']
         for col in chemical_columns:
             if col in df.columns:
-                mask = df[col].notna()
-                if mask.sum() > 0:
-                    # Convert to numeric, handling any string values
-                    df.loc[mask, col] = pd.to_numeric(df.loc[mask, col], errors='coerce')
-                    mask = df[col].notna()  # Re-check after conversion
-                    if mask.sum() > 0:
-                        factors = np.random.uniform(0.8, 1.2, mask.sum())
-                        df.loc[mask, col] = df.loc[mask, col] * factors
-        
+                self._masked_mul(df, col, 0.8, 1.2)
+
         return df
     
     def mask_particle_size_distribution(self, df):
         """Mask PSD data while maintaining curve shape"""
         # Find PSD columns (numeric column names representing sizes)
-        psd_columns = []
-        for col in df.columns:
-            try:
-                # Check if column name is a number (particle size)
-                float(col)
-                psd_columns.append(col)
-            except:
-                # Also check for columns with 'mm' in the name
-                if 'mm' in str(col) and col not in ['0.075 mm']:
-                    continue
-                elif col == '0.075 mm' or (col.replace('.', '').replace(' ', '').isdigit()):
-                    if col not in psd_columns:
-                        psd_columns.append(col)
+        psd_columns = [
+            col for col in df.columns
+            if isinstance(col, (int, float)) or (isinstance(col, str) and _PSD_RE.match(col))
+        ]
         
         if psd_columns:
-            for idx in df.index:
-                # Get all PSD values for this row
-                psd_values = df.loc[idx, psd_columns]
-                
-                # Only process if we have valid data
-                if psd_values.notna().sum() > 3:  # Need at least 3 points
-                    # Apply smooth random variation
-                    mask = psd_values.notna()
-                    valid_cols = [col for col in psd_columns if mask[col]]
-                    
-                    if len(valid_cols) > 0:
-                        variations = np.random.uniform(-5, 5, len(valid_cols))
-                        
-                        # Apply variations
-                        for i, col in enumerate(valid_cols):
-                            new_val = df.loc[idx, col] + variations[i]
-                            df.loc[idx, col] = np.clip(new_val, 0, 100)
-                        
-                        # Normalize to maintain monotonic increase
-                        values = df.loc[idx, valid_cols].values
-                        values = np.sort(values)  # Ensure monotonic
-                        df.loc[idx, valid_cols] = values
-        
+            # Work on the whole PSD block as one 2-D array instead of per-row df.loc
+            M = df[psd_columns].to_numpy(dtype=np.float64)
+            valid = ~np.isnan(M)
+            rows = valid.sum(axis=1) > 3  # Need at least 3 points per row
+
+            if rows.any():
+                sub = M[rows]
+                sub_valid = valid[rows]
+
+                # Apply smooth random variation and clip to 0-100
+                variations = self.rng.uniform(-5, 5, sub.shape)
+                np.add(sub, variations, out=sub, where=sub_valid)
+                np.clip(sub, 0, 100, out=sub)
+
+                # Normalize to maintain monotonic increase: sort each row's valid
+                # values (NaNs pushed to the end as +inf) and scatter them back
+                # into the valid positions in column order
+                sorted_vals = np.sort(np.where(sub_valid, sub, np.inf), axis=1)
+                order = np.argsort(~sub_valid, axis=1, kind='stable')
+                row_idx = np.arange(sub.shape[0])[:, None]
+                sub[row_idx, order] = sorted_vals
+                sub[~sub_valid] = np.nan
+
+                M[rows] = sub
+                df[psd_columns] = M
+
         return df
     
-    def process_file(self, input_file, output_file, file_type='interp'):
-        """Process a complete Excel file"""
-        print(f"Processing {input_file}...")
-        
-        # Read the Excel file
-        df = pd.read_excel(input_file)
+    def process_file(self, df, output_file, file_type='interp'):
+        """Process an already-loaded Excel DataFrame"""
+        print(f"Processing -> {output_file}...")
+
         original_shape = df.shape
-        
+
+        # Low-cardinality text columns as category dtype: mapping becomes a
+        # K-entry category rename instead of N per-row object lookups
+        for col in ['Hole_ID', 'Geology_Orgin', 'Consistency', 'Report']:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+
+        # Mixed string/number cells load as object dtype; coerce the masked
+        # numeric columns to float once here so every masker reads a plain
+        # float column instead of re-running pd.to_numeric per call
+        if file_type == 'lab':
+            for col in self.MASKED_NUMERIC_COLUMNS:
+                if col in df.columns and df[col].dtype == object:
+                    df[col] = pd.to_numeric(df[col], errors='coerce')
+
         # Apply transformations
         df = self.mask_borehole_ids(df)
         df = self.mask_location_data(df)
@@ -338,8 +455,17 @@ class GeotechnicalDataMasker:
             df = self.mask_chemical_properties(df)
             df = self.mask_particle_size_distribution(df)
         
-        # Save the masked file
-        df.to_excel(output_file, index=False)
+        # Save the masked file, streaming rows out via xlsxwriter when installed
+        # instead of building the whole sheet in memory with openpyxl
+        try:
+            with pd.ExcelWriter(
+                output_file,
+                engine="xlsxwriter",
+                engine_kwargs={"options": {"constant_memory": True, "strings_to_urls": False}},
+            ) as writer:
+                df.to_excel(writer, index=False)
+        except (ImportError, ValueError):
+            df.to_excel(output_file, index=False)
         print(f"  Saved to {output_file}")
         print(f"  Shape: {original_shape} -> {df.shape}")
         
@@ -347,93 +473,129 @@ class GeotechnicalDataMasker:
     
     def generate_report(self, output_file='Masking_Report.txt'):
         """Generate a report of all transformations applied"""
+        # Assemble the report in memory and write it in one call; per-line
+        # f.write scales with the number of mapping entries
+        parts = []
+        a = parts.append
+        a("=" * 60 + "\n")
+        a("GEOTECHNICAL DATA MASKING REPORT\n")
+        a(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        a("=" * 60 + "\n\n")
+
+        a("1. BOREHOLE ID MAPPINGS\n")
+        a("-" * 30 + "\n")
+        a(f"Total boreholes masked: {len(self.borehole_mapping)}\n")
+        a("Sample mappings:\n")
+        parts.extend(f"  {orig} -> {new}\n" for orig, new in list(self.borehole_mapping.items())[:10])
+        a("\n")
+
+        a("2. LOCATION DATA OFFSETS\n")
+        a("-" * 30 + "\n")
+        a(f"Easting offset: +{self.easting_offset:,} m\n")
+        a(f"Northing offset: +{self.northing_offset:,} m\n")
+        a(f"Chainage offset: {self.chainage_offset:,} m\n")
+        a(f"Surface RL variation: ±{self.rl_variation} m\n\n")
+
+        a("3. GEOLOGICAL CLASSIFICATIONS\n")
+        a("-" * 30 + "\n")
+        a("Geology mappings:\n")
+        parts.extend(f"  {orig} -> {new}\n" for orig, new in self.geology_mapping.items())
+        a("\n")
+
+        a("4. REPORT REFERENCES\n")
+        a("-" * 30 + "\n")
+        a(f"Total reports masked: {len(self.report_mapping)}\n")
+        parts.extend(f"  {orig} -> {new}\n" for orig, new in self.report_mapping.items())
+        a("\n")
+
+        a("5. TECHNICAL DATA VARIATIONS\n")
+        a("-" * 30 + "\n")
+        a("SPT N-values: 0.8-1.2x multiplier\n")
+        a("Atterberg Limits: ±5% for LL, ±3% for PL\n")
+        a("UCS: 0.85-1.15x multiplier\n")
+        a("Cohesion: 0.9-1.1x multiplier\n")
+        a("Friction angle: ±2 degrees\n")
+        a("MDD: ±0.05 t/m³\n")
+        a("OMC: ±2%\n")
+        a("CBR: 0.85-1.15x multiplier\n")
+        a("pH: ±0.3 units\n")
+        a("Chemical properties: 0.8-1.2x multiplier\n")
+        a("PSD: ±5% smooth variation\n\n")
+
+        a("=" * 60 + "\n")
+        a("END OF REPORT\n")
+        a("=" * 60 + "\n")
+
         with open(output_file, 'w') as f:
-            f.write("=" * 60 + "\n")
-            f.write("GEOTECHNICAL DATA MASKING REPORT\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 60 + "\n\n")
-            
-            f.write("1. BOREHOLE ID MAPPINGS\n")
-            f.write("-" * 30 + "\n")
-            f.write(f"Total boreholes masked: {len(self.borehole_mapping)}\n")
-            f.write("Sample mappings:\n")
-            for i, (orig, new) in enumerate(list(self.borehole_mapping.items())[:10]):
-                f.write(f"  {orig} -> {new}\n")
-            f.write("\n")
-            
-            f.write("2. LOCATION DATA OFFSETS\n")
-            f.write("-" * 30 + "\n")
-            f.write(f"Easting offset: +{self.easting_offset:,} m\n")
-            f.write(f"Northing offset: +{self.northing_offset:,} m\n")
-            f.write(f"Chainage offset: {self.chainage_offset:,} m\n")
-            f.write(f"Surface RL variation: ±{self.rl_variation} m\n\n")
-            
-            f.write("3. GEOLOGICAL CLASSIFICATIONS\n")
-            f.write("-" * 30 + "\n")
-            f.write("Geology mappings:\n")
-            for orig, new in self.geology_mapping.items():
-                f.write(f"  {orig} -> {new}\n")
-            f.write("\n")
-            
-            f.write("4. REPORT REFERENCES\n")
-            f.write("-" * 30 + "\n")
-            f.write(f"Total reports masked: {len(self.report_mapping)}\n")
-            for orig, new in self.report_mapping.items():
-                f.write(f"  {orig} -> {new}\n")
-            f.write("\n")
-            
-            f.write("5. TECHNICAL DATA VARIATIONS\n")
-            f.write("-" * 30 + "\n")
-            f.write("SPT N-values: 0.8-1.2x multiplier\n")
-            f.write("Atterberg Limits: ±5% for LL, ±3% for PL\n")
-            f.write("UCS: 0.85-1.15x multiplier\n")
-            f.write("Cohesion: 0.9-1.1x multiplier\n")
-            f.write("Friction angle: ±2 degrees\n")
-            f.write("MDD: ±0.05 t/m³\n")
-            f.write("OMC: ±2%\n")
-            f.write("CBR: 0.85-1.15x multiplier\n")
-            f.write("pH: ±0.3 units\n")
-            f.write("Chemical properties: 0.8-1.2x multiplier\n")
-            f.write("PSD: ±5% smooth variation\n\n")
-            
-            f.write("=" * 60 + "\n")
-            f.write("END OF REPORT\n")
-            f.write("=" * 60 + "\n")
-        
+            f.write("".join(parts))
+
         print(f"Report saved to {output_file}")
 
 
+def read_excel_fast(input_file):
+    """Read an XLSX file, preferring the Rust-based calamine engine when installed"""
+    try:
+        return pd.read_excel(input_file, engine="calamine")
+    except (ImportError, ValueError):
+        return pd.read_excel(input_file)
+
+
+def _mask_worker(masker_state, df, output_file, file_type, seed):
+    """Rebuild a masker from shared mapping state and process one file.
+
+    Runs in a ProcessPoolExecutor worker. The seed is a SeedSequence spawned
+    in the parent, so the parallel run stays reproducible.
+    """
+    masker = GeotechnicalDataMasker(seed=seed)
+    masker.__dict__.update(masker_state)
+    return masker.process_file(df, output_file, file_type=file_type)
+
+
 def main():
     """Main execution function"""
     print("=" * 60)
     print("GEOTECHNICAL DATA MASKING TOOL")
     print("=" * 60)
-    
+
     # Initialize the masker
     masker = GeotechnicalDataMasker()
-    
+
     # File paths
     file1_input = "BH_Interp - LGCFR.xlsx"
     file1_output = "BH_Interp_DEMO.xlsx"
-    
+
     file2_input = "Lab_summary_final_with_SPT - LGCFR.xlsx"
     file2_output = "Lab_summary_final_with_SPT_DEMO.xlsx"
-    
-    # Read both files to create consistent borehole mapping
-    print("\n1. Creating consistent borehole ID mappings...")
-    df1_temp = pd.read_excel(file1_input)
-    df2_temp = pd.read_excel(file2_input)
-    
+
+    # Read each file exactly once and reuse the frames for mapping + processing
+    print("\n1. Reading files and creating consistent borehole ID mappings...")
+    df1 = read_excel_fast(file1_input)
+    df2 = read_excel_fast(file2_input)
+
     masker.create_borehole_mapping([
-        df1_temp['Hole_ID'].unique(),
-        df2_temp['Hole_ID'].unique()
+        df1['Hole_ID'].unique(),
+        df2['Hole_ID'].unique()
     ])
+    masker.create_report_mapping(
+        [df[col] for df in (df1, df2) for col in ['Report'] if col in df.columns]
+    )
     print(f"   Created mappings for {len(masker.borehole_mapping)} unique boreholes")
-    
-    # Process both files
-    print("\n2. Processing files...")
-    df1 = masker.process_file(file1_input, file1_output, file_type='interp')
-    df2 = masker.process_file(file2_input, file2_output, file_type='lab')
+
+    # Process both files, one worker each: with the mappings pre-built they
+    # are independent, so the wall-clock cost is the slower of the two
+    print("\n2. Processing files in parallel...")
+    masker_state = {
+        'borehole_mapping': masker.borehole_mapping,
+        'report_mapping': masker.report_mapping,
+        'borehole_counter': masker.borehole_counter,
+        'report_counter': masker.report_counter,
+    }
+    seed1, seed2 = np.random.SeedSequence(42).spawn(2)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        future1 = executor.submit(_mask_worker, masker_state, df1, file1_output, 'interp', seed1)
+        future2 = executor.submit(_mask_worker, masker_state, df2, file2_output, 'lab', seed2)
+        df1 = future1.result()
+        df2 = future2.result()
     
     # Generate report
     print("\n3. Generating transformation report...")
@@ -7,18 +7,20 @@ Geotechnical Data Masking Script V2
 
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set random seed for reproducibility
-np.random.seed(42)
-
 class GeotechnicalDataMaskerV2:
-    def __init__(self, max_boreholes=100):
+    def __init__(self, max_boreholes=100, seed=42):
         """Initialize the data masker with transformation mappings"""
-        
+
         self.max_boreholes = max_boreholes
+
+        # Single seeded PCG64 generator for every draw; seed accepts an int
+        # or a SeedSequence so parallel workers get independent streams
+        self.rng = np.random.default_rng(seed)
         self.selected_boreholes = []
         
         # Geological origin mappings
@@ -73,15 +75,24 @@ class GeotechnicalDataMaskerV2:
         
         # Coordinate transformation parameters
         self.coord_transform = {
-            'rotation_angle': np.random.uniform(15, 45),  # Degrees
-            'translation_e': np.random.uniform(-30000, 30000),  # Within Zone 56
-            'translation_n': np.random.uniform(-20000, 20000),
+            'rotation_angle': self.rng.uniform(15, 45),  # Degrees
+            'translation_e': self.rng.uniform(-30000, 30000),  # Within Zone 56
+            'translation_n': self.rng.uniform(-20000, 20000),
             'scatter_radius': 500  # Random scatter up to 500m
         }
         
         # Store original coordinates for selected boreholes
         self.original_coords = {}
-        self.transformed_coords = {}
+        self._center = None  # Rotation center, cached after selection
+
+        # Per-borehole scatter offsets, drawn in one batch after selection
+        self._scatter_e = pd.Series(dtype=np.float64)
+        self._scatter_n = pd.Series(dtype=np.float64)
+
+        # Per-borehole coordinate deltas (rotation + translation + scatter),
+        # precomputed after selection so each file's pass is a map and an add
+        self._delta_e = pd.Series(dtype=np.float64)
+        self._delta_n = pd.Series(dtype=np.float64)
         
     def select_boreholes_spatially(self, df_lab, df_interp):
         """Select 100 boreholes with good spatial distribution"""
@@ -99,23 +110,22 @@ class GeotechnicalDataMaskerV2:
             coords = unique_bh_coords[['Easting (m)', 'Northing (m)']].values
             
             try:
-                # K-means clustering approach to ensure spatial distribution
-                from sklearn.cluster import KMeans
-                kmeans = KMeans(n_clusters=min(self.max_boreholes, len(unique_bh_coords)), 
-                              random_state=42, n_init=10)
+                # Mini-batch K-means clustering to ensure spatial distribution
+                # without full-dataset Lloyd iterations
+                from sklearn.cluster import MiniBatchKMeans
+                from sklearn.metrics import pairwise_distances_argmin
+                kmeans = MiniBatchKMeans(n_clusters=min(self.max_boreholes, len(unique_bh_coords)),
+                                         random_state=42, n_init=3, batch_size=256)
                 kmeans.fit(coords)
-                
-                # Select one borehole closest to each cluster center
-                selected_indices = []
-                for center in kmeans.cluster_centers_:
-                    distances = np.sqrt(((coords - center) ** 2).sum(axis=1))
-                    closest_idx = np.argmin(distances)
-                    if closest_idx not in selected_indices:
-                        selected_indices.append(closest_idx)
-                
+
+                # Select one borehole closest to each cluster center, found
+                # for all centers in a single BLAS-backed argmin call
+                closest = pairwise_distances_argmin(kmeans.cluster_centers_, coords)
+                selected_indices = list(pd.unique(closest))
+
                 # If we need more, add random selections
                 while len(selected_indices) < self.max_boreholes and len(selected_indices) < len(unique_bh_coords):
-                    idx = np.random.randint(0, len(unique_bh_coords))
+                    idx = int(self.rng.integers(0, len(unique_bh_coords)))
                     if idx not in selected_indices:
                         selected_indices.append(idx)
             except ImportError:
@@ -123,40 +133,34 @@ class GeotechnicalDataMaskerV2:
                 e_min, e_max = coords[:, 0].min(), coords[:, 0].max()
                 n_min, n_max = coords[:, 1].min(), coords[:, 1].max()
                 
-                # Create a grid
+                # Create a grid and assign every point to a cell in one
+                # vectorized pass instead of masking per cell
                 grid_size = int(np.sqrt(self.max_boreholes))
                 e_bins = np.linspace(e_min, e_max, grid_size + 1)
                 n_bins = np.linspace(n_min, n_max, grid_size + 1)
-                
-                selected_indices = []
-                for i in range(grid_size):
-                    for j in range(grid_size):
-                        # Find points in this grid cell
-                        mask = ((coords[:, 0] >= e_bins[i]) & (coords[:, 0] < e_bins[i+1]) &
-                               (coords[:, 1] >= n_bins[j]) & (coords[:, 1] < n_bins[j+1]))
-                        cell_indices = np.where(mask)[0]
-                        
-                        if len(cell_indices) > 0:
-                            # Select one random point from this cell
-                            selected_idx = np.random.choice(cell_indices)
-                            selected_indices.append(selected_idx)
-                            
-                            if len(selected_indices) >= self.max_boreholes:
-                                break
-                    if len(selected_indices) >= self.max_boreholes:
-                        break
-                
+                e_idx = np.clip(np.digitize(coords[:, 0], e_bins) - 1, 0, grid_size - 1)
+                n_idx = np.clip(np.digitize(coords[:, 1], n_bins) - 1, 0, grid_size - 1)
+                cell = e_idx * grid_size + n_idx
+
+                # One random point per occupied cell: shuffle the points, then
+                # keep the first occurrence of each cell id
+                perm = self.rng.permutation(len(coords))
+                _, first_in_cell = np.unique(cell[perm], return_index=True)
+                selected_indices = list(perm[first_in_cell][:self.max_boreholes])
+
                 # If we need more, add random selections
                 while len(selected_indices) < self.max_boreholes and len(selected_indices) < len(unique_bh_coords):
-                    idx = np.random.randint(0, len(unique_bh_coords))
+                    idx = int(self.rng.integers(0, len(unique_bh_coords)))
                     if idx not in selected_indices:
                         selected_indices.append(idx)
             
             selected_bh = unique_bh_coords.iloc[selected_indices]['Hole_ID'].tolist()
         
         # Also include boreholes that are in BH_Interp but not in Lab_summary
+        # (build the lab set once, the old per-element .unique() was O(N^2))
         all_interp_bh = df_interp['Hole_ID'].unique()
-        additional_bh = [bh for bh in all_interp_bh if bh not in df_lab['Hole_ID'].unique()]
+        lab_bh_set = set(df_lab['Hole_ID'].unique())
+        additional_bh = [bh for bh in all_interp_bh if bh not in lab_bh_set]
         
         # Add some of these if we have room
         remaining_slots = self.max_boreholes - len(selected_bh)
@@ -174,22 +178,61 @@ class GeotechnicalDataMaskerV2:
                     'easting': bh_data.iloc[0]['Easting (m)'],
                     'northing': bh_data.iloc[0]['Northing (m)']
                 }
-        
+
+        # Draw the per-borehole scatter for every selected borehole in one
+        # batch; the row-level passes then just map these series
+        n = len(self.selected_boreholes)
+        scatter_angle = self.rng.uniform(0, 2 * np.pi, n)
+        scatter_dist = self.rng.uniform(0, self.coord_transform['scatter_radius'], n)
+        self._scatter_e = pd.Series(scatter_dist * np.cos(scatter_angle), index=self.selected_boreholes)
+        self._scatter_n = pd.Series(scatter_dist * np.sin(scatter_angle), index=self.selected_boreholes)
+
+        # A borehole is a fixed point, so its full transform (rotation,
+        # translation, scatter) collapses to one coordinate delta; compute
+        # those once here and the per-file passes become map + add
+        if self.original_coords:
+            bh_index = list(self.original_coords.keys())
+            orig_e = np.array([self.original_coords[bh]['easting'] for bh in bh_index], dtype=np.float64)
+            orig_n = np.array([self.original_coords[bh]['northing'] for bh in bh_index], dtype=np.float64)
+            center_e, center_n = self._rotation_center()
+            angle_rad = np.radians(self.coord_transform['rotation_angle'])
+            cos_a, sin_a = np.cos(angle_rad), np.sin(angle_rad)
+            new_e = ((orig_e - center_e) * cos_a - (orig_n - center_n) * sin_a
+                     + center_e + self.coord_transform['translation_e'])
+            new_n = ((orig_e - center_e) * sin_a + (orig_n - center_n) * cos_a
+                     + center_n + self.coord_transform['translation_n'])
+            new_e += self._scatter_e.reindex(bh_index).fillna(0).to_numpy()
+            new_n += self._scatter_n.reindex(bh_index).fillna(0).to_numpy()
+            self._delta_e = pd.Series(new_e - orig_e, index=bh_index)
+            self._delta_n = pd.Series(new_n - orig_n, index=bh_index)
+
         return self.selected_boreholes
     
+    def _rotation_center(self):
+        """Center of the original selected coordinates, used for rotation.
+
+        Computed once and cached; the old per-call rebuild iterated all of
+        original_coords on every transform.
+        """
+        if self._center is None:
+            if self.original_coords:
+                coords_arr = np.array(
+                    [[c['easting'], c['northing']] for c in self.original_coords.values()],
+                    dtype=np.float64,
+                )
+                self._center = tuple(np.nanmean(coords_arr, axis=0))
+            else:
+                self._center = (513283, 6940374)  # Approximate center from analysis
+        return self._center
+
     def transform_coordinates(self, easting, northing, borehole_id=None):
-        """Apply rotation, translation, and random scatter to coordinates"""
+        """Apply rotation, translation, and random scatter to a single coordinate pair"""
         if pd.isna(easting) or pd.isna(northing):
             return easting, northing
-        
+
         # Get center of original coordinates for rotation
-        if self.original_coords:
-            center_e = np.mean([c['easting'] for c in self.original_coords.values() if not pd.isna(c['easting'])])
-            center_n = np.mean([c['northing'] for c in self.original_coords.values() if not pd.isna(c['northing'])])
-        else:
-            center_e = 513283  # Approximate center from analysis
-            center_n = 6940374
-        
+        center_e, center_n = self._rotation_center()
+
         # Translate to origin
         e_centered = easting - center_e
         n_centered = northing - center_n
@@ -205,19 +248,15 @@ class GeotechnicalDataMaskerV2:
         
         # Add random scatter (consistent for same borehole)
         if borehole_id:
-            if borehole_id not in self.transformed_coords:
-                # Generate random scatter for this borehole
-                scatter_angle = np.random.uniform(0, 2 * np.pi)
-                scatter_dist = np.random.uniform(0, self.coord_transform['scatter_radius'])
-                scatter_e = scatter_dist * np.cos(scatter_angle)
-                scatter_n = scatter_dist * np.sin(scatter_angle)
-                self.transformed_coords[borehole_id] = {'scatter_e': scatter_e, 'scatter_n': scatter_n}
-            else:
-                scatter_e = self.transformed_coords[borehole_id]['scatter_e']
-                scatter_n = self.transformed_coords[borehole_id]['scatter_n']
-            
-            e_transformed += scatter_e
-            n_transformed += scatter_n
+            if borehole_id not in self._scatter_e.index:
+                # Generate random scatter for a borehole outside the batch
+                scatter_angle = self.rng.uniform(0, 2 * np.pi)
+                scatter_dist = self.rng.uniform(0, self.coord_transform['scatter_radius'])
+                self._scatter_e[borehole_id] = scatter_dist * np.cos(scatter_angle)
+                self._scatter_n[borehole_id] = scatter_dist * np.sin(scatter_angle)
+
+            e_transformed += self._scatter_e[borehole_id]
+            n_transformed += self._scatter_n[borehole_id]
         
         # Ensure we stay within reasonable UTM Zone 56 bounds
         e_transformed = np.clip(e_transformed, 300000, 700000)
@@ -234,212 +273,257 @@ class GeotechnicalDataMaskerV2:
         
         return self.borehole_mapping
     
+    @staticmethod
+    def apply_mapping(series, mapping):
+        """Dict mapping via pandas' C-level hash path, keeping unmapped (and NaN) values"""
+        mapped = series.map(mapping)
+        return mapped.where(mapped.notna(), series)
+
     def filter_and_mask_boreholes(self, df, id_column='Hole_ID'):
         """Filter to selected boreholes and apply ID masking"""
         # Filter to selected boreholes
         df_filtered = df[df[id_column].isin(self.selected_boreholes)].copy()
-        
+
         # Apply ID masking
         if id_column in df_filtered.columns:
-            df_filtered[id_column] = df_filtered[id_column].map(
-                lambda x: self.borehole_mapping.get(x, x) if pd.notna(x) else x
-            )
-        
+            df_filtered[id_column] = self.apply_mapping(df_filtered[id_column], self.borehole_mapping)
+
         return df_filtered
     
     def mask_location_data(self, df):
         """Mask location-related data with proper coordinate transformation"""
-        # Apply coordinate transformation
+        # Apply coordinate transformation: deltas were precomputed per
+        # borehole at selection time, so this pass is a map and two adds
         if 'Easting (m)' in df.columns and 'Northing (m)' in df.columns:
-            # Get borehole ID for consistent scatter
-            for idx in df.index:
-                bh_id = df.loc[idx, 'Hole_ID'] if 'Hole_ID' in df.columns else None
-                e_orig = df.loc[idx, 'Easting (m)']
-                n_orig = df.loc[idx, 'Northing (m)']
-                
-                if pd.notna(e_orig) and pd.notna(n_orig):
-                    e_new, n_new = self.transform_coordinates(e_orig, n_orig, bh_id)
-                    df.loc[idx, 'Easting (m)'] = e_new
-                    df.loc[idx, 'Northing (m)'] = n_new
+            E = df['Easting (m)'].to_numpy(dtype=np.float64)
+            N = df['Northing (m)'].to_numpy(dtype=np.float64)
+            valid = ~np.isnan(E) & ~np.isnan(N)
+
+            if valid.any():
+                # Hole_ID is rewritten to masked BH-### values before this
+                # pass runs, while the precomputed series are keyed by the
+                # original IDs — re-key them through the borehole mapping so
+                # the lookups actually hit
+                delta_e_by_id = self._delta_e.rename(self.borehole_mapping)
+                delta_n_by_id = self._delta_n.rename(self.borehole_mapping)
+
+                if 'Hole_ID' in df.columns and len(delta_e_by_id) > 0:
+                    delta_e = df['Hole_ID'].map(delta_e_by_id).to_numpy(dtype=np.float64)
+                    delta_n = df['Hole_ID'].map(delta_n_by_id).to_numpy(dtype=np.float64)
+                    covered = ~np.isnan(delta_e)
+                    e_new = E + np.where(covered, delta_e, 0.0)
+                    n_new = N + np.where(covered, delta_n, 0.0)
+                    fallback = valid & ~covered
+                else:
+                    e_new = E.copy()
+                    n_new = N.copy()
+                    fallback = valid.copy()
+
+                if fallback.any():
+                    # Rows without a precomputed delta (boreholes that were
+                    # not in the selection coordinates) get the full rotation
+                    center_e, center_n = self._rotation_center()
+                    angle_rad = np.radians(self.coord_transform['rotation_angle'])
+                    cos_a, sin_a = np.cos(angle_rad), np.sin(angle_rad)
+                    e_centered = E[fallback] - center_e
+                    n_centered = N[fallback] - center_n
+                    e_new[fallback] = (e_centered * cos_a - n_centered * sin_a
+                                       + center_e + self.coord_transform['translation_e'])
+                    n_new[fallback] = (e_centered * sin_a + n_centered * cos_a
+                                       + center_n + self.coord_transform['translation_n'])
+                    if 'Hole_ID' in df.columns:
+                        scatter_e_by_id = self._scatter_e.rename(self.borehole_mapping)
+                        scatter_n_by_id = self._scatter_n.rename(self.borehole_mapping)
+                        scatter_e = df['Hole_ID'].map(scatter_e_by_id).to_numpy(dtype=np.float64)[fallback]
+                        scatter_n = df['Hole_ID'].map(scatter_n_by_id).to_numpy(dtype=np.float64)[fallback]
+                        e_new[fallback] += np.where(np.isnan(scatter_e), 0.0, scatter_e)
+                        n_new[fallback] += np.where(np.isnan(scatter_n), 0.0, scatter_n)
+
+                # Ensure we stay within reasonable UTM Zone 56 bounds
+                np.clip(e_new, 300000, 700000, out=e_new)
+                np.clip(n_new, 6800000, 7100000, out=n_new)
+
+                df['Easting (m)'] = np.where(valid, e_new, E)
+                df['Northing (m)'] = np.where(valid, n_new, N)
         
         # Transform chainage with smaller variation
+        # (NaN + offset stays NaN, so no mask is needed for a scalar shift)
         if 'Chainage' in df.columns:
-            mask = df['Chainage'].notna()
             # Add random variation between -5000 and +5000
-            variation = np.random.uniform(-5000, 5000)
-            df.loc[mask, 'Chainage'] = df.loc[mask, 'Chainage'] + variation
-        
-        # Mask surface RL with random variation
+            variation = self.rng.uniform(-5000, 5000)
+            df['Chainage'] = df['Chainage'] + variation
+
+        # Mask surface RL with random variation, writing through plain
+        # ndarrays instead of the boolean-indexed .loc assignment path
         rl_columns = ['Surface RL (m AHD)', 'Surface RL (mAHD)', 'From (m AHD)']
         for col in rl_columns:
             if col in df.columns:
-                mask = df[col].notna()
-                if mask.sum() > 0:
-                    random_variation = np.random.uniform(-10, 10, mask.sum())
-                    df.loc[mask, col] = df.loc[mask, col] + random_variation
+                arr = df[col].to_numpy(dtype=np.float64)
+                mask = ~np.isnan(arr)
+                n = int(mask.sum())
+                if n > 0:
+                    arr[mask] += self.rng.uniform(-10, 10, n)
+                    df[col] = arr
         
         return df
     
     def mask_geological_classifications(self, df):
         """Mask geological classifications"""
         if 'Geology_Orgin' in df.columns:
-            df['Geology_Orgin'] = df['Geology_Orgin'].map(
-                lambda x: self.geology_mapping.get(x, x) if pd.notna(x) else x
-            )
-        
+            df['Geology_Orgin'] = self.apply_mapping(df['Geology_Orgin'], self.geology_mapping)
+
         if 'Consistency' in df.columns:
-            df['Consistency'] = df['Consistency'].map(
-                lambda x: self.consistency_mapping.get(x, x) if pd.notna(x) else x
-            )
-        
+            df['Consistency'] = self.apply_mapping(df['Consistency'], self.consistency_mapping)
+
         return df
     
+    def create_report_mapping(self, dfs):
+        """Create report name mapping across files up front.
+
+        Building the full mapping before the per-file passes keeps report
+        names consistent when the files are processed in parallel workers.
+        """
+        for df in dfs:
+            if 'Report' in df.columns:
+                self._add_report_mappings(pd.unique(df['Report'].dropna().values))
+
+        return self.report_mapping
+
+    @staticmethod
+    def _report_label(counter):
+        """Letter code for a report: A-Z, then AA, AB, ... beyond 26"""
+        label = ''
+        while counter > 0:
+            counter, rem = divmod(counter - 1, 26)
+            label = chr(65 + rem) + label
+        return label
+
+    def _add_report_mappings(self, unique_reports):
+        """Extend the report mapping for any unseen reports in one batch"""
+        new = [report for report in unique_reports if report not in self.report_mapping]
+        labels = [f"Geotechnical Report {self._report_label(i)}"
+                  for i in range(self.report_counter, self.report_counter + len(new))]
+        self.report_mapping.update(zip(new, labels))
+        self.report_counter += len(new)
+
     def mask_report_names(self, df):
         """Mask report references"""
         if 'Report' in df.columns:
-            unique_reports = df['Report'].dropna().unique()
-            for report in unique_reports:
-                if report not in self.report_mapping:
-                    self.report_mapping[report] = f"Geotechnical Report {chr(64 + self.report_counter)}"
-                    self.report_counter += 1
-            
-            df['Report'] = df['Report'].map(
-                lambda x: self.report_mapping.get(x, x) if pd.notna(x) else x
-            )
-        
-        return df
-    
-    # Include all the technical data masking methods from the original script
-    def mask_spt_data(self, df):
-        """Mask SPT N-values with realistic variation"""
-        if 'SPT N Value' in df.columns:
-            mask = df['SPT N Value'].notna()
-            if mask.sum() > 0:
-                factors = np.random.uniform(0.8, 1.2, mask.sum())
-                df.loc[mask, 'SPT N Value'] = np.round(df.loc[mask, 'SPT N Value'] * factors).astype(int)
-                df.loc[mask, 'SPT N Value'] = df.loc[mask, 'SPT N Value'].clip(lower=0)
-        
-        if 'Interpreted Su (4.5)' in df.columns:
-            mask = df['Interpreted Su (4.5)'].notna()
-            if mask.sum() > 0:
-                factors = np.random.uniform(0.85, 1.15, mask.sum())
-                df.loc[mask, 'Interpreted Su (4.5)'] = df.loc[mask, 'Interpreted Su (4.5)'] * factors
-        
-        return df
-    
-    def mask_atterberg_limits(self, df):
-        """Mask Atterberg limits while maintaining relationships"""
-        if 'LL (%)' in df.columns and 'PL (%)' in df.columns:
-            ll_mask = df['LL (%)'].notna()
-            if ll_mask.sum() > 0:
-                ll_variation = np.random.uniform(-5, 5, ll_mask.sum())
-                df.loc[ll_mask, 'LL (%)'] = (df.loc[ll_mask, 'LL (%)'] + ll_variation).clip(lower=0)
-            
-            pl_mask = df['PL (%)'].notna()
-            if pl_mask.sum() > 0:
-                pl_variation = np.random.uniform(-3, 3, pl_mask.sum())
-                df.loc[pl_mask, 'PL (%)'] = (df.loc[pl_mask, 'PL (%)'] + pl_variation).clip(lower=0)
-            
-            if 'PI (%)' in df.columns:
-                pi_mask = df['LL (%)'].notna() & df['PL (%)'].notna()
-                df.loc[pi_mask, 'PI (%)'] = df.loc[pi_mask, 'LL (%)'] - df.loc[pi_mask, 'PL (%)']
-                df.loc[pi_mask, 'PI (%)'] = df.loc[pi_mask, 'PI (%)'].clip(lower=0)
-        
-        mc_columns = ['MC (%) - from Atterberg test', 'MC (%) - from CBR test', 'MC before Swell Test (%)']
-        for col in mc_columns:
-            if col in df.columns:
-                mask = df[col].notna()
-                if mask.sum() > 0:
-                    variation = np.random.uniform(-2, 2, mask.sum())
-                    df.loc[mask, col] = (df.loc[mask, col] + variation).clip(lower=0)
-        
-        return df
-    
-    def mask_strength_parameters(self, df):
-        """Mask strength parameters"""
-        if 'UCS (MPa)' in df.columns:
-            mask = df['UCS (MPa)'].notna()
-            if mask.sum() > 0:
-                factors = np.random.uniform(0.85, 1.15, mask.sum())
-                df.loc[mask, 'UCS (MPa)'] = (df.loc[mask, 'UCS (MPa)'] * factors).clip(lower=0.1)
-        
-        cohesion_columns = ['Cohesion (kPa)_multi_stage', 'Cohesion (kPa)_single_stage']
-        for col in cohesion_columns:
-            if col in df.columns:
-                mask = df[col].notna()
-                if mask.sum() > 0:
-                    factors = np.random.uniform(0.9, 1.1, mask.sum())
-                    df.loc[mask, col] = (df.loc[mask, col] * factors).clip(lower=0)
-        
-        friction_columns = ['Friction angle_multi_stage', 'Friction angle_single_stage']
-        for col in friction_columns:
-            if col in df.columns:
-                mask = df[col].notna()
-                if mask.sum() > 0:
-                    variation = np.random.uniform(-2, 2, mask.sum())
-                    df.loc[mask, col] = (df.loc[mask, col] + variation).clip(lower=0, upper=45)
-        
-        is50_columns = ['Is(50) Axial', 'Is(50) Diametral', 'Is50 combined', 'Is50d (MPa)', 'Is50a (MPa)']
-        for col in is50_columns:
-            if col in df.columns:
-                mask = df[col].notna()
-                if mask.sum() > 0:
-                    factors = np.random.uniform(0.85, 1.15, mask.sum())
-                    df.loc[mask, col] = df.loc[mask, col] * factors
-        
-        return df
-    
-    def mask_compaction_data(self, df):
-        """Mask compaction data"""
-        if 'MDD (t/m3)' in df.columns:
-            mask = df['MDD (t/m3)'].notna()
-            if mask.sum() > 0:
-                variation = np.random.uniform(-0.05, 0.05, mask.sum())
-                df.loc[mask, 'MDD (t/m3)'] = (df.loc[mask, 'MDD (t/m3)'] + variation).clip(lower=1.3, upper=2.6)
-        
-        if 'OMC (%)' in df.columns:
-            mask = df['OMC (%)'].notna()
-            if mask.sum() > 0:
-                variation = np.random.uniform(-2, 2, mask.sum())
-                df.loc[mask, 'OMC (%)'] = (df.loc[mask, 'OMC (%)'] + variation).clip(lower=3, upper=40)
-        
+            self._add_report_mappings(df['Report'].dropna().unique())
+            df['Report'] = self.apply_mapping(df['Report'], self.report_mapping)
+
         return df
     
-    def mask_cbr_data(self, df):
-        """Mask CBR data"""
-        if 'CBR (%) Soaked - 4 Days' in df.columns:
-            mask = df['CBR (%) Soaked - 4 Days'].notna()
-            if mask.sum() > 0:
-                factors = np.random.uniform(0.85, 1.15, mask.sum())
-                df.loc[mask, 'CBR (%) Soaked - 4 Days'] = (df.loc[mask, 'CBR (%) Soaked - 4 Days'] * factors).clip(lower=1)
-        
-        if 'CBR Swell (%)' in df.columns:
-            mask = df['CBR Swell (%)'].notna()
-            if mask.sum() > 0:
-                factors = np.random.uniform(0.9, 1.1, mask.sum())
-                df.loc[mask, 'CBR Swell (%)'] = (df.loc[mask, 'CBR Swell (%)'] * factors).clip(lower=0)
-        
+    # All technical data variations as one spec table:
+    # (column, op, low, high, clip_lower, clip_upper, round_result)
+    _LAB_MASK_SPEC = (
+        # SPT
+        ('SPT N Value', 'mul', 0.8, 1.2, 0, None, True),
+        ('Interpreted Su (4.5)', 'mul', 0.85, 1.15, None, None, False),
+        # Atterberg limits and moisture content
+        ('LL (%)', 'add', -5, 5, 0, None, False),
+        ('PL (%)', 'add', -3, 3, 0, None, False),
+        ('MC (%) - from Atterberg test', 'add', -2, 2, 0, None, False),
+        ('MC (%) - from CBR test', 'add', -2, 2, 0, None, False),
+        ('MC before Swell Test (%)', 'add', -2, 2, 0, None, False),
+        # Strength parameters
+        ('UCS (MPa)', 'mul', 0.85, 1.15, 0.1, None, False),
+        ('Cohesion (kPa)_multi_stage', 'mul', 0.9, 1.1, 0, None, False),
+        ('Cohesion (kPa)_single_stage', 'mul', 0.9, 1.1, 0, None, False),
+        ('Friction angle_multi_stage', 'add', -2, 2, 0, 45, False),
+        ('Friction angle_single_stage', 'add', -2, 2, 0, 45, False),
+        ('Is(50) Axial', 'mul', 0.85, 1.15, None, None, False),
+        ('Is(50) Diametral', 'mul', 0.85, 1.15, None, None, False),
+        ('Is50 combined', 'mul', 0.85, 1.15, None, None, False),
+        ('Is50d (MPa)', 'mul', 0.85, 1.15, None, None, False),
+        ('Is50a (MPa)', 'mul', 0.85, 1.15, None, None, False),
+        # Compaction
+        ('MDD (t/m3)', 'add', -0.05, 0.05, 1.3, 2.6, False),
+        ('OMC (%)', 'add', -2, 2, 3, 40, False),
+        # CBR
+        ('CBR (%) Soaked - 4 Days', 'mul', 0.85, 1.15, 1, None, False),
+        ('CBR Swell (%)', 'mul', 0.9, 1.1, 0, None, False),
+        # Chemical properties
+        ('pH value', 'add', -0.3, 0.3, 3, 10, False),
+        ('Sulphates (mg/kg)', 'mul', 0.8, 1.2, None, None, False),
+        ('Chlorides (mg/kg)', 'mul', 0.8, 1.2, None, None, False),
+        ('Conductivity (uS/cm)', 'mul', 0.8, 1.2, None, None, False),
+    )
+
+    def _apply_mask_spec(self, df, spec):
+        """Apply add/mul jitter specs, one fused ndarray pass per column.
+
+        All randomness comes from a single uniform draw sized to the total
+        non-NaN cell count, sliced and rescaled per column, instead of one
+        small RNG dispatch per spec entry.
+        """
+        pending = []
+        for col, op, low, high, clip_lower, clip_upper, round_result in spec:
+            if col not in df.columns:
+                continue
+            series = df[col]
+            if series.dtype == object:
+                series = pd.to_numeric(series, errors='coerce')
+            # Work in the column's own float width so downcast columns keep
+            # their halved memory footprint through the pass
+            arr = series.to_numpy()
+            if arr.dtype.kind != 'f':
+                arr = arr.astype(np.float64)
+            mask = ~np.isnan(arr)
+            n = int(mask.sum())
+            if n > 0:
+                pending.append((col, op, low, high, clip_lower, clip_upper, round_result, arr, mask, n))
+
+        if not pending:
+            return df
+
+        u = self.rng.random(sum(entry[-1] for entry in pending))
+        offset = 0
+        for col, op, low, high, clip_lower, clip_upper, round_result, arr, mask, n in pending:
+            draw = low + (high - low) * u[offset:offset + n]
+            offset += n
+            if op == 'mul':
+                arr[mask] *= draw
+            else:
+                arr[mask] += draw
+            if round_result:
+                np.round(arr, out=arr)
+            if clip_lower is not None or clip_upper is not None:
+                np.clip(arr, clip_lower, clip_upper, out=arr)
+            df[col] = arr
         return df
-    
-    def mask_chemical_properties(self, df):
-        """Mask chemical properties"""
-        if 'pH value' in df.columns:
-            mask = df['pH value'].notna()
-            if mask.sum() > 0:
-                variation = np.random.uniform(-0.3, 0.3, mask.sum())
-                df.loc[mask, 'pH value'] = (df.loc[mask, 'pH value'] + variation).clip(lower=3, upper=10)
-        
-        chemical_columns = ['Sulphates (mg/kg)', 'Chlorides (mg/kg)', 'Conductivity (uS/cm)']
-        for col in chemical_columns:
-            if col in df.columns:
-                mask = df[col].notna()
-                if mask.sum() > 0:
-                    df.loc[mask, col] = pd.to_numeric(df.loc[mask, col], errors='coerce')
-                    mask = df[col].notna()
-                    if mask.sum() > 0:
-                        factors = np.random.uniform(0.8, 1.2, mask.sum())
-                        df.loc[mask, col] = df.loc[mask, col] * factors
-        
+
+    def mask_technical_data(self, df):
+        """Mask all technical lab data (SPT, Atterberg, strength, compaction,
+        CBR, chemical) through the shared spec table, then recompute PI so the
+        LL/PL relationship still holds."""
+        # float32 halves the bytes every masking pass touches, and the
+        # applied jitter dwarfs the precision loss. Coordinates are left
+        # float64 for metre-level precision on 1e6-scale UTM values.
+        # Mixed string/number columns (the chemical ones) are coerced here
+        # too, so the spec pass never re-runs pd.to_numeric.
+        for col, *_ in self._LAB_MASK_SPEC:
+            if col not in df.columns:
+                continue
+            if df[col].dtype == object:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float32)
+            elif df[col].dtype.kind == 'f':
+                df[col] = df[col].astype(np.float32)
+
+        df = self._apply_mask_spec(df, self._LAB_MASK_SPEC)
+
+        if 'PI (%)' in df.columns and 'LL (%)' in df.columns and 'PL (%)' in df.columns:
+            # Derive PI from the jittered arrays directly; one shared mask
+            # instead of four boolean-indexed .loc scans
+            ll = df['LL (%)'].to_numpy()
+            pl = df['PL (%)'].to_numpy()
+            pi = df['PI (%)'].to_numpy()
+            if pi.dtype.kind != 'f':
+                pi = pi.astype(np.float64)
+            both = ~np.isnan(ll) & ~np.isnan(pl)
+            pi[both] = np.clip(ll[both] - pl[both], 0, None)
+            df['PI (%)'] = pi
+
         return df
     
     def process_files(self, file1_input, file1_output, file2_input, file2_output):
@@ -450,47 +534,47 @@ class GeotechnicalDataMaskerV2:
         
         # Read original files
         print("\n1. Reading original files...")
-        df1_orig = pd.read_excel(file1_input)
-        df2_orig = pd.read_excel(file2_input)
+        df1_orig = _read_excel(file1_input)
+        df2_orig = _read_excel(file2_input)
         print(f"   BH_Interp: {df1_orig.shape}")
         print(f"   Lab_summary: {df2_orig.shape}")
         
         # Select boreholes spatially
         selected = self.select_boreholes_spatially(df2_orig, df1_orig)
         
-        # Create borehole mapping
+        # Create borehole and report mappings before the per-file passes so
+        # the parallel workers agree on every masked name
         print("\n2. Creating borehole ID mappings...")
         self.create_borehole_mapping()
+        self.create_report_mapping([df1_orig, df2_orig])
         print(f"   Created mappings for {len(self.borehole_mapping)} boreholes")
-        
-        # Process BH_Interp file
-        print("\n3. Processing BH_Interp file...")
-        df1 = self.filter_and_mask_boreholes(df1_orig, 'Hole_ID')
-        df1 = self.mask_location_data(df1)
-        df1 = self.mask_geological_classifications(df1)
-        df1 = self.mask_report_names(df1)
-        
-        # Process Lab_summary file
-        print("\n4. Processing Lab_summary file...")
-        df2 = self.filter_and_mask_boreholes(df2_orig, 'Hole_ID')
-        df2 = self.mask_location_data(df2)
-        df2 = self.mask_geological_classifications(df2)
-        df2 = self.mask_report_names(df2)
-        df2 = self.mask_spt_data(df2)
-        df2 = self.mask_atterberg_limits(df2)
-        df2 = self.mask_strength_parameters(df2)
-        df2 = self.mask_compaction_data(df2)
-        df2 = self.mask_cbr_data(df2)
-        df2 = self.mask_chemical_properties(df2)
-        
+
+        # Process both files, one worker each; with selection, mappings and
+        # scatter pre-built they share no mutable state
+        print("\n3. Processing files in parallel...")
+        seed1, seed2 = np.random.SeedSequence(42).spawn(2)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            future1 = executor.submit(_process_worker, self, df1_orig, False, seed1)
+            future2 = executor.submit(_process_worker, self, df2_orig, True, seed2)
+            df1 = future1.result()
+            df2 = future2.result()
+
         # Save files
-        print("\n5. Saving masked files...")
+        print("\n4. Saving masked files...")
         df1.to_excel(file1_output, index=False)
         print(f"   Saved {file1_output}: {df1.shape}")
         
         df2.to_excel(file2_output, index=False)
         print(f"   Saved {file2_output}: {df2.shape}")
-        
+
+        # Parquet copies for downstream pipeline consumers; the columnar
+        # format reads back roughly an order of magnitude faster than xlsx
+        try:
+            df1.to_parquet(file1_output.replace('.xlsx', '.parquet'))
+            df2.to_parquet(file2_output.replace('.xlsx', '.parquet'))
+        except ImportError:
+            pass  # pyarrow not installed, the xlsx outputs are still written
+
         return df1, df2
     
     def generate_report(self, output_file='Masking_Report_V2.txt'):
@@ -552,6 +636,31 @@ class GeotechnicalDataMaskerV2:
         print(f"\nReport saved to {output_file}")
 
 
+def _process_worker(masker, df, technical, seed):
+    """Mask one already-loaded DataFrame in a worker process.
+
+    The masker arrives pickled with selection, mappings and scatter already
+    built, so the per-file passes are independent. Each worker gets a fresh
+    generator from a parent-spawned SeedSequence for reproducibility.
+    """
+    masker.rng = np.random.default_rng(seed)
+    df = masker.filter_and_mask_boreholes(df, 'Hole_ID')
+    df = masker.mask_location_data(df)
+    df = masker.mask_geological_classifications(df)
+    df = masker.mask_report_names(df)
+    if technical:
+        df = masker.mask_technical_data(df)
+    return df
+
+
+def _read_excel(input_file):
+    """Read an XLSX file with the Rust-based calamine engine if available"""
+    try:
+        return pd.read_excel(input_file, engine="calamine")
+    except (ImportError, ValueError):
+        return pd.read_excel(input_file)
+
+
 def main():
     """Main execution function"""
     # Import KMeans at module level or use alternative
@@ -598,10 +707,11 @@ def main():
         print(f"  Northing: {n_min:.0f} to {n_max:.0f}")
         print(f"  Within Zone 56: {'YES' if 300000 <= e_min and e_max <= 700000 else 'NO'}")
     
-    # Check common boreholes
-    df1_holes = set(df1['Hole_ID'].unique())
-    df2_holes = set(df2['Hole_ID'].unique())
-    common = df1_holes.intersection(df2_holes)
+    # Check common boreholes with one sorted-merge intersection instead of
+    # building two Python sets on top of the unique() hash tables
+    df1_holes = df1['Hole_ID'].unique()
+    df2_holes = df2['Hole_ID'].unique()
+    common = np.intersect1d(df1_holes, df2_holes, assume_unique=True)
     print(f"\nBorehole counts:")
     print(f"  BH_Interp: {len(df1_holes)} unique boreholes")
     print(f"  Lab_summary: {len(df2_holes)} unique boreholes")
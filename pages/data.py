@@ -32,7 +32,7 @@ def show():
 
     with col3:
         initial_prompt = auto_prompt()
-        chatbot_chat_interface(prompt, geophysics_data, initial_prompt)
+        chatbot_chat_interface(prompt, geophysics_digest(geophysics_data), initial_prompt)
 
 
        
@@ -1,7 +1,40 @@
 import streamlit as st
+from utils import *
+from LLM_OOP import *
 
 
 def show():
     st.title("Multiple Analysis Page")
-    st.write(st.session_state)
 
+    uploaded_files, geophysics_data = get_uploaded_data()
+
+    if len(geophysics_data) == 0:
+        st.warning("No data uploaded yet. Please upload CSV files in the sidebar.")
+        return
+
+    selected_lines = st.multiselect(
+        "Select lines to analyse:",
+        options=list(geophysics_data.keys()),
+        default=list(geophysics_data.keys()),
+    )
+
+    if st.button("Analyse selected lines") and selected_lines:
+        prompts = [
+            f"""
+            You are an expert in geophysics data analysis.
+            Summarize the key statistics of geophysics line {line_name} in maximum 100 words.
+            Highlight any anomalies in the data.
+
+            Summary statistics:
+            {geophysics_data[line_name].describe().to_string()}
+            """
+            for line_name in selected_lines
+        ]
+
+        # One concurrent call per line instead of N sequential round trips
+        with st.spinner("Analysing lines concurrently..."):
+            results = run_batch(prompts)
+
+        for line_name, result in zip(selected_lines, results):
+            st.subheader(line_name)
+            st.write(result)
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""Regenerate static/custom.css from the default apply_custom_css parameters."""
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from css import _DEFAULT_PARAMS, _build_custom_css, _STATIC_CSS
+
+
+def main():
+    block = _build_custom_css(*_DEFAULT_PARAMS).strip()
+    # Strip the inline <style> wrapper, the file is served as a real stylesheet
+    css_text = block.removeprefix("<style>").removesuffix("</style>").strip() + "\n"
+    _STATIC_CSS.parent.mkdir(parents=True, exist_ok=True)
+    _STATIC_CSS.write_text(css_text)
+    print(f"Wrote {_STATIC_CSS} ({len(css_text)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
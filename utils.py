@@ -1,6 +1,11 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import io
+import json
 import streamlit as st
-from LLM_OOP import *
-import pandas as pd
+from css import adjust_title_font_size
 
 # =========== Login Page ===========
 def login_page(page_title):
@@ -58,12 +63,16 @@ def login_page(page_title):
             st.stop()
 
 
+# Only the digest is kept in memory; compare_digest keeps the check
+# constant-time
+_PW_HASH = hashlib.sha256(b"1").digest()
+
 def check_password():
         """Check user input and store login status"""
 
-        PASSWORD = "1"
+        entered = hashlib.sha256(st.session_state["password_input"].encode()).digest()
 
-        if st.session_state["password_input"] == PASSWORD:
+        if hmac.compare_digest(entered, _PW_HASH):
             st.session_state['password_correct'] = True
             del st.session_state["password_input"]
         else:
@@ -112,6 +121,10 @@ def sidebar_success(message):
         """
     )
 
+def _file_key(f):
+    # 16-byte blake2b of the payload: content-addressed identity for uploads
+    return hashlib.blake2b(f.getvalue(), digest_size=16).hexdigest()
+
 def upload_geophysics_file():
     uploaded = st.sidebar.file_uploader(
         label="Geophysics data",
@@ -122,17 +135,22 @@ def upload_geophysics_file():
     )
 
     if uploaded:
-        existing_names = {f.name for f in st.session_state.get('uploaded_files', [])}
-        new_files = [f for f in uploaded if f.name not in existing_names]
-
+        # Content-hash dedup, maintained incrementally: re-uploads of
+        # identical bytes are ignored even under a new name, while an edited
+        # file arriving under the same name is treated as new
+        existing_keys = st.session_state.setdefault('uploaded_file_keys', set())
+        keys = [_file_key(f) for f in uploaded]
+        new_files = [f for f, key in zip(uploaded, keys) if key not in existing_keys]
 
         if new_files:
             # Append only new files
             current_files = st.session_state.get('uploaded_files', [])
             st.session_state['uploaded_files'] = current_files + new_files
+            existing_keys.update(keys)
 
     elif 'uploaded_files' not in st.session_state:
         st.session_state['uploaded_files'] = []
+        st.session_state['uploaded_file_keys'] = set()
 
 # =========== Data page utils ===========
 def get_uploaded_data():
@@ -145,7 +163,40 @@ def get_uploaded_data():
 
     return uploaded_files, geophysics_data
 
+@st.cache_data(show_spinner=False)
+def _read_csv_cached(content: bytes, name: str) -> pd.DataFrame:
+    # Keyed by file content (and name), so re-uploads of identical files and
+    # unrelated reruns hit Streamlit's cache instead of re-parsing the CSV.
+    # pandas is imported here (cached in sys.modules after the first call)
+    # so pages that only draw login/CSS skip loading it at startup
+    import pandas as pd
+    try:
+        # pyarrow's multi-threaded CSV reader, when available
+        df = pd.read_csv(io.BytesIO(content), engine='pyarrow')
+    except (ImportError, ValueError):
+        df = pd.read_csv(io.BytesIO(content))
+
+    # Low-cardinality text columns (Consistency, Geology_Orgin, ...) become
+    # categoricals so downstream merges and groupbys run on integer codes
+    for col in df.columns[df.dtypes == object]:
+        if df[col].nunique(dropna=True) < 0.5 * len(df):
+            df[col] = df[col].astype('category')
+
+    return df
+
+@st.cache_data(show_spinner=False)
+def _preview_cached(content: bytes, name: str, nrows: int = 20) -> pd.DataFrame:
+    # One small preview frame per unique upload, so reruns hand st.dataframe
+    # 20 rows to hash and serialize instead of slicing the full file again.
+    # Parsed with nrows so the preview never pays for the whole file
+    # (the pyarrow engine doesn't support nrows; the C parser stops early)
+    import pandas as pd
+    return pd.read_csv(io.BytesIO(content), nrows=nrows)
+
+@st.fragment
 def display_uploaded_data(uploaded_files, geophysics_data):
+    # Fragment: moving the column slider reruns just this preview block,
+    # not the whole page script
     # uploaded_files, geophysics_data = get_uploaded_data()
 
     if len(uploaded_files) == 0:
@@ -156,22 +207,53 @@ def display_uploaded_data(uploaded_files, geophysics_data):
         number_of_columns = st.slider("Number of columns to display", min_value=1, max_value=8, value=3, step=1)
         cols = st.columns(number_of_columns)
 
+        # filename stems computed once, not per cell per rerun
+        stems = [f.name.removesuffix(".csv") for f in uploaded_files]
+
         for idx, uploaded_file in enumerate(uploaded_files):
             col_idx = idx % number_of_columns
             with cols[col_idx]:
 
-                uploaded_filename = uploaded_file.name.rstrip(".csv")
+                uploaded_filename = stems[idx]
+                payload = uploaded_file.getvalue()
 
-                if uploaded_filename not in geophysics_data.keys():
+                if uploaded_filename not in geophysics_data:
                     try:
-                        geophysics_data[uploaded_filename] = pd.read_csv(uploaded_file)
+                        geophysics_data[uploaded_filename] = _read_csv_cached(payload, uploaded_file.name)
                     except Exception as e:
                         st.error(f"Error loading {uploaded_file.name}: {e}")
                         continue
 
                 st.write(f"{idx+1}, {uploaded_file.name}")
-                if uploaded_filename in geophysics_data.keys():
-                    st.dataframe(geophysics_data[uploaded_filename].head(20))
+                if uploaded_filename in geophysics_data:
+                    st.dataframe(_preview_cached(payload, uploaded_file.name))
+
+@st.cache_data
+def geophysics_digest(geophysics_data, char_budget=8000):
+    """
+    Build a token-budgeted digest (schema + head rows + summary stats) of the
+    uploaded data to send to the LLM instead of the full DataFrames.
+    The budget is enforced with the ~4 chars/token heuristic, dropping the
+    stats and then the head rows if the digest runs over.
+    """
+    digest = {}
+    for name, df in geophysics_data.items():
+        digest[name] = {
+            'nrows': len(df),
+            'cols': df.columns.tolist(),
+            'head': df.head(3).to_dict(orient='list'),
+            'describe': df.describe().round(2).to_dict(),
+        }
+
+    digest_text = json.dumps(digest, default=str)
+    for key in ('describe', 'head'):
+        if len(digest_text) <= char_budget:
+            break
+        for entry in digest.values():
+            entry.pop(key, None)
+        digest_text = json.dumps(digest, default=str)
+
+    return digest_text
 
 def check_file_changes(geophysics_data):
     current_files = list(geophysics_data.keys())